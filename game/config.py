@@ -1,4 +1,4 @@
-
+import os
 
 #
 # ---------- Central configuration constants ----------
@@ -14,4 +14,13 @@ MAX_QUEUE_DISPLAY = 20         # max bar length for queue display
 
 # Time system
 MINUTES_PER_TURN = 15
-TURNS_PER_DAY    = int((8 * 60) / MINUTES_PER_TURN)   # 08:00‑16:00 → 32 turns
\ No newline at end of file
+TURNS_PER_DAY    = int((8 * 60) / MINUTES_PER_TURN)   # 08:00‑16:00 → 32 turns
+
+# Persistence
+AUTOSAVE_PATH = os.path.join(os.path.expanduser("~"), ".boba_tycoon", "autosave.boba")
+
+# GUI refresh
+UI_FPS        = 30             # max UI updates per second while a day runs
+TURN_DELAY_MS = 100            # pause between turns when not at max speed
+LOG_MAX_LINES = 2000           # lines kept in the simulation log widget
+CHART_PRELOAD_DELAY_MS = 250   # start importing the charting stack this long after first paint
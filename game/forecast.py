@@ -0,0 +1,109 @@
+from collections import OrderedDict
+
+from game.config import TURNS_PER_DAY
+from game.utils.math_utils import percentile
+
+# Simulated days per forecast
+FORECAST_REPLICAS = 200
+
+# Forecasts kept in memory (least recently used are dropped)
+FORECAST_CACHE_SIZE = 32
+
+# Stock given to every ingredient in the simulated days, so the forecast
+# measures demand rather than what today's stock happens to allow
+AMPLE_STOCK = 10 ** 9
+
+_cache = OrderedDict()
+
+
+def forecast_key(game, replicas=FORECAST_REPLICAS, seed=0, turns=TURNS_PER_DAY):
+    """Everything a one-day demand forecast depends on, as a hashable tuple."""
+    venue = game.venue
+    return (
+        type(venue).__name__, venue.maxLine, venue.footTraffic, venue.basePatience,
+        tuple(
+            (d.name, d.basePrice, d.desirability,
+             tuple((ing.id, qty) for ing, qty in d.recipe.items()))
+            for d in game.menu
+        ),
+        tuple((e.capacity, e.charm) for e in game.employees),
+        game.adFactor, game.mode, turns, replicas, seed,
+    )
+
+
+def forecast_demand(game, replicas=FORECAST_REPLICAS, seed=0, turns=TURNS_PER_DAY):
+    """
+    Expected and P90 one-day consumption per ingredient and per drink.
+
+    Runs `replicas` forks of the game for one day each (fork i seeded with
+    seed + i) with unlimited stock. Results are memoized on the venue,
+    menu, staff and adFactor, so asking again for an unchanged shop is free.
+    """
+    key = forecast_key(game, replicas, seed, turns)
+    forecast = _cache.get(key)
+    if forecast is not None:
+        _cache.move_to_end(key)
+        return forecast
+
+    forecast = DemandForecast(replicas)
+    for i in range(replicas):
+        sim = game.fork(seed + i)
+        for ing in sim.ingredients:
+            sim.stock[ing] = AMPLE_STOCK
+
+        summary = sim.run_day(turns)
+        sold = {}
+        for hour in summary["hour_sales"].values():
+            for name, count in hour.items():
+                sold[name] = sold.get(name, 0) + count
+        # Lots spoiling overnight leave stock too, but are not demand
+        spoiled = summary["spoiled"]
+        used = {}
+        for ing, qty in sim.stock.items():
+            units = AMPLE_STOCK - qty - spoiled.get(ing, 0)
+            if units:
+                used[ing] = units
+        forecast.add(sold, used)
+
+    forecast.finish()
+    _cache[key] = forecast
+    if len(_cache) > FORECAST_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return forecast
+
+
+def clear_forecast_cache():
+    _cache.clear()
+
+
+class DemandForecast:
+    """
+    Per-day consumption distributions from a batch of simulated days.
+    drinks is keyed by drink name, ingredients by Ingredient; each value is
+    {"mean": ..., "p90": ...}.
+    """
+    def __init__(self, replicas):
+        self.replicas = replicas
+        self.drinks = {}
+        self.ingredients = {}
+        self._samples = ({}, {})
+
+    def add(self, sold, used):
+        for samples, counts in zip(self._samples, (sold, used)):
+            for key, count in counts.items():
+                samples.setdefault(key, []).append(count)
+
+    def finish(self):
+        for out, samples in zip((self.drinks, self.ingredients), self._samples):
+            for key, values in samples.items():
+                # Replicas that used none of it count as zeros
+                values = sorted(values + [0] * (self.replicas - len(values)))
+                out[key] = {
+                    "mean": sum(values) / self.replicas,
+                    "p90": percentile(values, 0.90),
+                }
+        self._samples = None
+
+    def demand(self, menu, stat="mean"):
+        """{drink: cups} for the drinks in `menu`, as the purchase planner takes it."""
+        return {d: self.drinks[d.name][stat] for d in menu if d.name in self.drinks}
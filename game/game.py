@@ -1,20 +1,48 @@
-from game.config import *
+from game.config import STARTING_CASH, MINUTES_PER_TURN, TURNS_PER_DAY
 from .models.venue import Stand, Truck, Store
 from .models.drink import Drink
-from .models.customer import Customer
-from .utils.constants import *
-from .systems.arrivals import generate_arrivals
-from .systems.turn_engine import process_turn
-from .systems.inventory import *
+from .utils.constants import (
+    INGREDIENTS, CUP_REGULAR, CUP_TALL, STRAW, SEAL,
+    BOBA_PEARLS, CANE_SUGAR, WHOLE_MILK,
+)
+from .systems.arrivals import generate_arrivals, generate_arrivals_many, enqueue_customers
+from .systems.turn_engine import get_turn_engine
+from .systems.inventory import Stock
 from .systems.hiring import generate_candidates
 from .systems.advertising import calculate_ad_factor
 from .models.staff import Staff
 from game.models.loan import Loan
-import random
+from .systems.drink_choice import DrinkChooser
+from .utils.tracked_list import TrackedList
+from .systems.rng import RngService
+from .systems.event_engine import run_day_events
+import copy
+
+
+SIM_MODES = ("turns", "events")
+
+# Parts of the game state a view can refresh independently
+DIRTY_SECTIONS = ("cash", "venue", "staff", "menu", "stock", "loans")
+
+
+def clock_from_turn(turn_idx: int) -> str:
+    minutes = turn_idx * MINUTES_PER_TURN
+    hour = 8 + minutes // 60
+    minute = minutes % 60
+    return f"{hour:02d}:{minute:02d}"
+
+
+def hours_of_day(turns: int = TURNS_PER_DAY) -> list[str]:
+    """Hour labels ("08:00", ...) covered by a day of `turns` turns."""
+    return sorted({clock_from_turn(t).split(":")[0] + ":00" for t in range(turns)})
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, turn_engine="python", seed=None, mode="turns"):
+        # --- Change Tracking (for incremental UI refresh) ---
+        self._dirty = set(DIRTY_SECTIONS)
+        self._seen_versions = None
+
         # --- Core Game State ---
         self.cash = STARTING_CASH
         self.day = 1
@@ -27,10 +55,13 @@ class Game:
 
         # --- Inventory ---
         self.ingredients = INGREDIENTS
-        self.stock = {
+        self.stock = Stock(self.ingredients, {
             ing: (100 if ing in {CUP_REGULAR, CUP_TALL, STRAW, SEAL} else 50)
             for ing in self.ingredients
-        }
+        })
+
+        # Supplier prices; created on the first offers() call (imports NumPy)
+        self.market = None
 
         # --- Default Menu ---
         self.menu = [
@@ -44,21 +75,163 @@ class Game:
 
         # --- Daily Parameters ---
         self.adBudget = 0
+        self.opening_cash = self.cash
         self.adFactor = 0
         self.dailyIngredientCost = 0
         self.dailyAdSpend = 0
 
+        # --- Simulation ---
+        # "turns": fixed TURNS_PER_DAY ticks; "events": discrete-event day
+        if mode not in SIM_MODES:
+            raise ValueError(f"Unknown simulation mode {mode!r}, expected one of {SIM_MODES}")
+        self.mode = mode
+        self.rng = RngService(seed)
+        self.turn_engine = turn_engine
+        self.process_turn = get_turn_engine(turn_engine)
+
+    # -------------------------------------------------------
+    # Change Tracking
+    # -------------------------------------------------------
+    @property
+    def cash(self):
+        return self._cash
+
+    @cash.setter
+    def cash(self, value):
+        self._cash = value
+        self._dirty.add("cash")
+
+    @property
+    def venue(self):
+        return self._venue
+
+    @venue.setter
+    def venue(self, venue):
+        self._venue = venue
+        self._dirty.add("venue")
+
+    def take_dirty(self):
+        """
+        Sections changed since the last call, plus the set of ingredients
+        whose stock changed. Menu and staff changes are picked up from their
+        list versions and the drink price version.
+
+        Not synchronized with a day running on another thread: a change made
+        while the sets are swapped can be missed, so views refresh everything
+        once the day has finished.
+        """
+        versions = (self._menu.version, Drink.price_version, self._employees.version)
+        seen = self._seen_versions
+        if seen is None or versions[:2] != seen[:2]:
+            self._dirty.add("menu")
+        if seen is None or versions[2] != seen[2]:
+            self._dirty.add("staff")
+        self._seen_versions = versions
+
+        ingredients = self.stock.take_dirty()
+        if ingredients:
+            self._dirty.update(("stock", "menu"))   # menu shows cups left
+
+        dirty, self._dirty = self._dirty, set()
+        return dirty, ingredients
+
     # -------------------------------------------------------
     # Drink Selection Logic
     # -------------------------------------------------------
+    @property
+    def menu(self):
+        return self._menu
+
+    @menu.setter
+    def menu(self, drinks):
+        self._menu = TrackedList(drinks)
+        self._drink_chooser = None
+
+    @property
+    def employees(self):
+        return self._employees
+
+    @employees.setter
+    def employees(self, staff):
+        self._employees = TrackedList(staff)
+        self._drink_chooser = None
+
+    def drink_chooser(self):
+        """Cached DrinkChooser, rebuilt only after the menu, a price or the staff changes."""
+        key = (self._menu.version, self._employees.version, Drink.price_version)
+        if self._drink_chooser is None or self._drink_chooser_key != key:
+            self._drink_chooser = DrinkChooser(self._menu, self._employees)
+            self._drink_chooser_key = key
+        return self._drink_chooser
+
     def pickDrink(self, customer):
-        affordable = [d for d in self.menu if d.basePrice <= customer.maxAfford]
-        if not affordable:
-            return None
+        return self.pick_drink(customer.maxAfford)
+
+    def pick_drink(self, max_afford):
+        return self.drink_chooser().pick(max_afford, self.rng.drink)
+
+    def reseed(self, seed):
+        """Restart every random stream from a new seed."""
+        self.rng = RngService(seed)
+
+    # -------------------------------------------------------
+    # What-if Branching
+    # -------------------------------------------------------
+    def fork(self, seed=None):
+        """
+        Cheap independent copy of the game for simulating alternatives.
+
+        Ingredients, recipes and staff are shared; stock is copy-on-write;
+        drinks, loans, the line and the supplier market are shallow copies.
+        The fork draws from fresh random streams seeded with `seed`, so forks
+        made with the same seed see the same customers (common random numbers).
+        """
+        other = Game.__new__(Game)
+        state = self.__dict__.copy()
+        state.pop("_recipe_matrix", None)
+        other.__dict__ = state
+        other._dirty = set(DIRTY_SECTIONS)
+
+        drinks = {id(d): copy.copy(d) for d in self._menu}
+        other.menu = [drinks[id(d)] for d in self._menu]
+        other.employees = self._employees
+        other.loans = [copy.copy(loan) for loan in self.loans]
+        other.stock = self.stock.copy()
+
+        other.venue = copy.copy(self.venue)
+        other.venue.line = self.venue.line.copy(drinks)
+
+        if self.market is not None:
+            other.market = self.market.copy()
+
+        other.rng = RngService(seed)
+        return other
+
+    # -------------------------------------------------------
+    # Inventory
+    # -------------------------------------------------------
+    def buy_stock(self, ing, qty, cost):
+        """
+        Add a purchase to stock as a lot that spoils after the ingredient's
+        shelf life, and charge it to today's ingredient cost.
+        """
+        self.cash -= cost
+        self.stock.receive(ing, qty, self.day + ing.shelf_life, cost / qty if qty else 0.0)
+        self.dailyIngredientCost += cost
+
+    def offers(self):
+        """
+        Today's supplier offers. Prices move once per day (see
+        SupplierMarket), so every call on the same day returns the same offers.
+        """
+        if self.market is None:
+            from .systems.market import SupplierMarket
+            self.market = SupplierMarket(self.ingredients, self.day, self.rng.market)
+        return self.market.offers(self.day, self.rng.market)
 
-        total_charm = sum(e.charm for e in self.employees)
-        weights = [d.desirability * (1 + 0.05 * total_charm) for d in affordable]
-        return random.choices(affordable, weights=weights, k=1)[0]
+    def drain_stock_deltas(self):
+        """Net stock change per ingredient since the last call."""
+        return self.stock.drain_deltas()
 
     # -------------------------------------------------------
     # Loan Handling (PER TURN)
@@ -67,51 +240,189 @@ class Game:
         if not self.loans:
             return
 
-        for loan in self.loans[:]:
-            if loan.remaining_balance <= 0:
-                self.loans.remove(loan)
-                continue
-            
-            # Fixed principal payment
-            principal_payment = loan.principal * loan.payback_rate
-            principal_payment = min(principal_payment, loan.remaining_balance)
-            print('principle',principal_payment)
-            self.cash -= principal_payment
-            self.dailyLoanPayments += principal_payment
-            loan.remaining_balance -= principal_payment
+        # Payments come from each loan's precomputed amortization schedule
+        self._dirty.add("loans")
+        for loan in self.loans:
+            payment = loan.pay_day()
+            self.cash -= payment
+            self.dailyLoanPayments += payment
 
-            # Compound interest AFTER payment
-            if loan.remaining_balance > 0:
-                loan.remaining_balance *= (1 + loan.interest_rate)
-
-            if loan.remaining_balance <= 0:
-                self.loans.remove(loan)
+        if any(loan.paid_off for loan in self.loans):
+            self.loans = [loan for loan in self.loans if not loan.paid_off]
 
     # -------------------------------------------------------
     # Single Turn Simulation
     # -------------------------------------------------------
-    def single_turn(self):
-        # 1. Customer arrivals
-        arrivals = generate_arrivals(self.venue, self.adFactor)
+    def single_turn(self, arrivals=None):
+        # 1. Customer arrivals (may be pre-sampled by the caller)
+        if arrivals is None:
+            arrivals = generate_arrivals(self.venue, self.adFactor, self.rng.arrivals)
+
+        lost_queue = enqueue_customers(self, arrivals)
+
+        # 2. Serve customers
+        served_count, lost_stock, lost_patience, drinks_served = self.process_turn(self)
+
+        return served_count, lost_queue, lost_stock, lost_patience, drinks_served
+
+    # -------------------------------------------------------
+    # Full Day Simulation (headless)
+    # -------------------------------------------------------
+    def run_day(self, turns=TURNS_PER_DAY, on_tick=None, fast_forward=True):
+        """
+        Simulate one full business day and settle end-of-day accounts.
+
+        on_tick, if given, is called after every turn with a dict describing
+        that turn (used by the GUI thread; not called in "events" mode).
+        With fast_forward, a run of turns with no arrivals and an empty line
+        is skipped in one step and reported as a single tick covering
+        info["turns"] turns. Returns the day summary dict.
+        """
+        self.opening_cash = self.cash
+        self.dailyLoanPayments = 0.0
+
+        if self.mode == "events":
+            stats, revenue, hour_sales = run_day_events(self, turns)
+        else:
+            stats, revenue, hour_sales = self._run_turns(turns, on_tick, fast_forward)
+
+        return self._settle_day(stats, revenue, hour_sales)
+
+    def _run_turns(self, turns, on_tick, fast_forward):
+        stats = {
+            "served": 0,
+            "lost_queue": 0,
+            "lost_stock": 0,
+            "lost_patience": 0,
+        }
+
+        hour_sales: dict[str, dict[str, int]] = {}
+
+        # Revenue = sum of prices of sold drinks (NOT cash delta)
+        revenue = 0.0
 
-        lost_queue = 0
-        for _ in range(arrivals):
-            cust = Customer(self.venue.basePatience)
-            drink = self.pickDrink(cust)
-            if not drink:
+        # Arrivals have their own random stream, so the whole day is sampled
+        # up front in one vectorized draw without shifting any other stream.
+        arrivals = generate_arrivals_many(self.venue, self.adFactor, turns, self.rng.arrivals)
+
+        # Ticks report per-turn changes only, not this morning's purchases
+        if on_tick is not None:
+            self.drain_stock_deltas()
+
+        t = 0
+        while t < turns:
+            if fast_forward and not arrivals[t] and not self.venue.line:
+                # Idle turns change nothing: no one to enqueue, serve or lose
+                run = 1
+                while t + run < turns and not arrivals[t + run]:
+                    run += 1
+
+                for i in range(t, t + run):
+                    hour_sales.setdefault(clock_from_turn(i).split(":")[0] + ":00", {})
+
+                if on_tick is not None:
+                    on_tick({
+                        "turn": t,
+                        "turns": run,
+                        "clock": clock_from_turn(t),
+                        "served": 0,
+                        "lost_queue": 0,
+                        "lost_stock": 0,
+                        "lost_patience": 0,
+                        "queue_size": 0,
+                        "cash": self.cash,
+                        "stock_changes": {},
+                        "sales": {},
+                    })
+                t += run
                 continue
 
-            cust.desiredDrink = drink
+            served, lostQ, lostS, lostP, drinks_list = self.single_turn(arrivals[t])
 
-            if len(self.venue.line) < self.venue.maxLine:
-                self.venue.line.append(cust)
-            else:
-                lost_queue += 1
+            stats["served"] += served
+            stats["lost_queue"] += lostQ
+            stats["lost_stock"] += lostS
+            stats["lost_patience"] += lostP
 
-        # 2. Serve customers
-        served_count, lost_stock, lost_patience, drinks_served = process_turn(self)
+            revenue += sum(d.basePrice for d in drinks_list)
 
-        return served_count, lost_queue, lost_stock, lost_patience, drinks_served
+            clock = clock_from_turn(t)
+            hour_label = clock.split(":")[0] + ":00"
+            sales = hour_sales.setdefault(hour_label, {})
+            turn_sales = {}
+
+            for drink in drinks_list:
+                sales[drink.name] = sales.get(drink.name, 0) + 1
+                turn_sales[drink.name] = turn_sales.get(drink.name, 0) + 1
+
+            if on_tick is None:
+                t += 1
+                continue
+
+            on_tick({
+                "turn": t,
+                "turns": 1,
+                "clock": clock,
+                "served": served,
+                "lost_queue": lostQ,
+                "lost_stock": lostS,
+                "lost_patience": lostP,
+                "queue_size": len(self.venue.line),
+                "cash": self.cash,
+                "stock_changes": self.drain_stock_deltas(),
+                "sales": turn_sales,
+            })
+            t += 1
+
+        return stats, revenue, hour_sales
+
+    def _settle_day(self, stats, revenue, hour_sales):
+        self.process_loans_per_day()
+
+        # End-of-day accounting
+        wages = sum(e.wage for e in self.employees)
+        rent = float(self.venue.rent)
+
+        # Loan payments made TODAY only
+        loans_today = float(self.dailyLoanPayments)
+        total_expenses = (
+            float(self.dailyIngredientCost)
+            + float(self.dailyAdSpend)
+            + float(wages)
+            + float(rent)
+            + loans_today
+        )
+
+        profit = revenue - total_expenses
+        self.cash -= (wages + rent)
+
+        # Lots that would expire overnight spoil at the end of the day
+        spoiled = self.stock.expire(self.day + 1)
+
+        return {
+            "day": self.day,
+            "served": stats["served"],
+            "lost_queue": stats["lost_queue"],
+            "lost_stock": stats["lost_stock"],
+            "lost_patience": stats["lost_patience"],
+            "revenue": revenue,
+            "expenses": total_expenses,
+            "loan_payments": loans_today,
+            "profit": profit,
+            "cash_start": self.opening_cash,
+            "cash_end": self.cash,
+            "hour_sales": hour_sales,
+            "spoiled": {ing: units for ing, (units, _) in spoiled.items()},
+            "spoilage_cost": sum(value for _, value in spoiled.values()),
+        }
+
+    def run_days(self, n, turns=TURNS_PER_DAY):
+        """Simulate n consecutive days headlessly. Returns the list of day summaries."""
+        summaries = []
+        for _ in range(n):
+            summaries.append(self.run_day(turns))
+            self.start_new_day()
+        return summaries
 
     # -------------------------------------------------------
     # Venue Upgrade
@@ -146,6 +457,7 @@ class Game:
 
         loan = Loan(loan_option)
         self.loans.append(loan)
+        self._dirty.add("loans")
         self.cash += loan.principal
         return True
 
@@ -153,6 +465,7 @@ class Game:
     # Day Transition (IMPORTANT)
     # -------------------------------------------------------
     def start_new_day(self):
+        self.day += 1
         self.dailyLoanPayments = 0.0
         self.dailyIngredientCost = 0.0
         self.dailyAdSpend = 0.0
\ No newline at end of file
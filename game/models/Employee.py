@@ -1,4 +1,6 @@
 class Employee:
+    __slots__ = ("name", "wage", "capacity", "reliability")
+
     def __init__(self, name, wage, capacity, reliability):
         self.name = name
         self.wage = wage
@@ -1,11 +1,19 @@
 import random
 
+
+def random_budget(rng=random):
+    """Most a customer is willing to pay for a drink."""
+    return round(rng.uniform(3, 9), 2)
+
+
 class Customer:
+    __slots__ = ("patience", "desiredDrink", "maxAfford")
+
     def __init__(self, basePatience, max_afford=None):
         self.patience = basePatience
         self.desiredDrink = None
 
         if max_afford is None:
-            self.maxAfford = round(random.uniform(3, 9), 2)
+            self.maxAfford = random_budget()
         else:
             self.maxAfford = max_afford
\ No newline at end of file
@@ -0,0 +1,180 @@
+from array import array
+
+from .customer import Customer
+
+
+class CustomerQueue:
+    """
+    Fixed-capacity ring buffer holding a venue's line as parallel arrays.
+
+    Each slot stores the decay step at which the customer gives up, the index
+    of their desired drink in `drinks`, and their budget. Patience is never
+    decremented per customer: decay() just advances a clock, and customers
+    whose deadline has passed are dropped from the head.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._deadline = array("l", [0]) * capacity
+        self._drink = array("l", [0]) * capacity
+        self._afford = array("d", [0.0]) * capacity
+        self._head = 0
+        self._size = 0
+        self._clock = 0
+
+        # True while deadlines are non-decreasing from head to tail, which is
+        # always the case when every customer arrives with the same patience.
+        self._ordered = True
+
+        # Drink table referenced by the _drink slots
+        self.drinks = []
+        self._drink_index = {}
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def full(self):
+        return self._size >= self.capacity
+
+    def drink_index(self, drink):
+        idx = self._drink_index.get(id(drink))
+        if idx is None:
+            idx = self._drink_index[id(drink)] = len(self.drinks)
+            self.drinks.append(drink)
+        return idx
+
+    # -------------------------------------------------------
+    # Enqueue / Dequeue
+    # -------------------------------------------------------
+    def push(self, patience, drink, max_afford=0.0):
+        """Add a customer at the tail. Returns False if the line is full."""
+        if self._size >= self.capacity:
+            return False
+
+        deadline = self._clock + patience
+        if self._size and deadline < self._deadline[self._slot(self._size - 1)]:
+            self._ordered = False
+
+        slot = self._slot(self._size)
+        self._deadline[slot] = deadline
+        self._drink[slot] = self.drink_index(drink)
+        self._afford[slot] = max_afford
+        self._size += 1
+        return True
+
+    def append(self, cust):
+        """deque-style append of a Customer object."""
+        if not self.push(cust.patience, cust.desiredDrink, cust.maxAfford):
+            raise OverflowError("line is full")
+
+    def pop_drink(self):
+        """Remove the customer at the head and return their desired drink."""
+        if not self._size:
+            raise IndexError("pop from an empty line")
+        drink = self.drinks[self._drink[self._head]]
+        self._advance(1)
+        return drink
+
+    def popleft(self):
+        """deque-style popleft returning a Customer object."""
+        if not self._size:
+            raise IndexError("pop from an empty line")
+        cust = self._customer(self._head)
+        self._advance(1)
+        return cust
+
+    def head_drinks(self, n):
+        """Drink-table indices of the first n customers, head first."""
+        return [self._drink[self._slot(i)] for i in range(min(n, self._size))]
+
+    def drop(self, n):
+        """Remove the first n customers."""
+        self._advance(min(n, self._size))
+
+    def copy(self, drink_map=None):
+        """
+        Independent copy of the line. drink_map ({id(old): new}) swaps in
+        replacement Drink objects, e.g. the copied menu of a forked game.
+        """
+        other = CustomerQueue.__new__(CustomerQueue)
+        other.__dict__.update(self.__dict__)
+        other._deadline = array("l", self._deadline)
+        other._drink = array("l", self._drink)
+        other._afford = array("d", self._afford)
+        if drink_map:
+            other.drinks = [drink_map.get(id(d), d) for d in self.drinks]
+        else:
+            other.drinks = list(self.drinks)
+        other._drink_index = {id(d): i for i, d in enumerate(other.drinks)}
+        return other
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
+        self._ordered = True
+
+    # -------------------------------------------------------
+    # Patience
+    # -------------------------------------------------------
+    def decay(self):
+        """
+        Reduce everyone's patience by one and remove customers who ran out.
+        Returns the number of customers who left.
+        """
+        self._clock += 1
+        if self._ordered:
+            lost = 0
+            while self._size and self._deadline[self._head] <= self._clock:
+                self._advance(1)
+                lost += 1
+            return lost
+        return self._compact()
+
+    def _compact(self):
+        kept = [
+            self._slot(i) for i in range(self._size)
+            if self._deadline[self._slot(i)] > self._clock
+        ]
+        rows = [(self._deadline[s], self._drink[s], self._afford[s]) for s in kept]
+        lost = self._size - len(kept)
+
+        self._head = 0
+        self._size = len(rows)
+        self._ordered = True
+        prev = None
+        for i, (deadline, drink, afford) in enumerate(rows):
+            self._deadline[i] = deadline
+            self._drink[i] = drink
+            self._afford[i] = afford
+            if prev is not None and deadline < prev:
+                self._ordered = False
+            prev = deadline
+        return lost
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+    def _slot(self, i):
+        return (self._head + i) % self.capacity
+
+    def _advance(self, n):
+        self._head = (self._head + n) % self.capacity
+        self._size -= n
+        if not self._size:
+            self._head = 0
+
+    def _customer(self, slot):
+        cust = Customer(self._deadline[slot] - self._clock, self._afford[slot])
+        cust.desiredDrink = self.drinks[self._drink[slot]]
+        return cust
+
+    def __setstate__(self, state):
+        # The drink index is keyed by id(), which does not survive pickling
+        self.__dict__.update(state)
+        self._drink_index = {id(d): i for i, d in enumerate(self.drinks)}
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self._customer(self._slot(i))
@@ -7,6 +7,8 @@ class Drink:
     Represents a drink sold in the shop.
     Uses a Recipe object for all ingredient logic.
     """
+    __slots__ = ("name", "basePrice", "recipe", "desirability")
+
     def __init__(self, name, recipe: dict, basePrice, baseDesirability, size = 'regular'):
         self.name = name
         self.basePrice = basePrice
@@ -19,5 +21,9 @@ class Drink:
         if size == "tall":
             self.desirability += 0.30
 
+    # Bumped on every price change so cached menu indexes can tell they are stale
+    price_version = 0
+
     def setPrice(self, price: float):
         self.basePrice = price
+        Drink.price_version += 1
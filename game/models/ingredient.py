@@ -1,7 +1,41 @@
 class Ingredient:
+    """
+    A stockable ingredient. Every instance gets a process-wide integer `id`
+    (creation order), usable as an array index. Ingredients are interned by
+    that id: unpickling returns the existing object, so identity-based
+    hashing and equality keep working across process pools and saves.
+    """
+    __slots__ = ("id", "name", "unit_cost", "shelf_life", "addedDesirability", "category")
+
+    # All ingredients created so far, indexed by id
+    registry = []
+
     def __init__(self, name, unit_cost, shelf_life, addedDesirability, category):
+        self.id = len(Ingredient.registry)
         self.name = name
         self.unit_cost = unit_cost
         self.shelf_life = shelf_life
         self.addedDesirability = addedDesirability
-        self.category = category
\ No newline at end of file
+        self.category = category
+        Ingredient.registry.append(self)
+
+    def __reduce__(self):
+        return _intern, (self.id, self.name, self.unit_cost, self.shelf_life,
+                         self.addedDesirability, self.category)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"Ingredient({self.id}, {self.name!r})"
+
+
+def _intern(id, name, *fields):
+    """Unpickle an Ingredient as the existing instance when there is one."""
+    registry = Ingredient.registry
+    if id < len(registry) and registry[id].name == name:
+        return registry[id]
+    return Ingredient(name, *fields)
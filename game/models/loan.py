@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+from ..systems.loan_engine import amortization_schedule
+
 
 class LoanOption:
+    __slots__ = ("name", "amount", "interest_rate", "payback_rate")
+
     def __init__(self, name: str, amount: float, interest_rate: float, payback_rate: float):
         self.name = name
         self.amount = float(amount)
@@ -14,16 +18,42 @@ class LoanOption:
 
 
 class Loan:
+    """
+    An active loan. Its balance is read from the option's precomputed
+    amortization schedule; `day` counts the payments made so far.
+    """
+    __slots__ = ("option", "principal", "interest_rate", "payback_rate",
+                 "payment_per_turn", "schedule", "day")
+
     def __init__(self, option: LoanOption):
         self.option = option
         self.principal = option.amount
         self.interest_rate = option.interest_rate
         self.payback_rate = option.payback_rate
         self.payment_per_turn = option.payment_per_turn
-        self.remaining_balance = option.amount
+        self.schedule = amortization_schedule(option)
+        self.day = 0
 
     @property
     def name(self) -> str:
         return self.option.name
+
+    @property
+    def remaining_balance(self) -> float:
+        return self.schedule.balance_after(self.day)
+
+    @property
+    def paid_off(self) -> bool:
+        return self.schedule.payoff_day is not None and self.day >= self.schedule.payoff_day
+
+    def pay_day(self) -> float:
+        """Make today's payment; returns the amount paid."""
+        paid = self.schedule.payment_on(self.day)
+        self.day += 1
+        return paid
+
+    def projection(self) -> dict:
+        """Payoff days, remaining cost, interest and cash flow from today on."""
+        return self.schedule.projection(self.day)
     def __str__(self):
         return self.name
\ No newline at end of file
@@ -5,6 +5,8 @@ class Recipe:
     Represents a drink recipe including ingredients and packaging.
     Automatically injects required packaging based on size.
     """
+    __slots__ = ("ingredients", "size")
+
     def __init__(self, ingredients: dict, size):
         # Copy to avoid mutating the input dictionary
         self.ingredients = dict(ingredients)
@@ -3,6 +3,8 @@ from .Employee import Employee
 
 class Staff(Employee):
     """Extended Employee with a charm trait (0-3 scale)."""
+    __slots__ = ("charm",)
+
     def __init__(self, name, wage, capacity, charm, reliability):
         super().__init__(name, wage, capacity, reliability)
         self.charm = charm  # 0–3
@@ -1,24 +1,33 @@
-from collections import deque
+from .customer_queue import CustomerQueue
 
 class Venue:
+    __slots__ = ("name", "maxLine", "footTraffic", "rent", "basePatience",
+                 "line", "drinks", "ingredients")
+
     def __init__(self, name, maxLine, footTraffic, rent, basePatience):
         self.name = name
         self.maxLine = maxLine
         self.footTraffic = footTraffic
         self.rent = rent
         self.basePatience = basePatience
-        self.line = deque()
+        self.line = CustomerQueue(maxLine)
         self.drinks = []
         self.ingredients = []
 
 class Stand(Venue):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Boba Stand", 5, 2, 20, 3)
 
 class Truck(Venue):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Boba Truck", 12, 4, 40, 4)
 
 class Store(Venue):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Boba Store", 30, 8, 80, 5)
\ No newline at end of file
@@ -0,0 +1,172 @@
+import math
+import multiprocessing
+import os
+import pickle
+import queue
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+
+from game.config import TURNS_PER_DAY
+from game.utils.math_utils import percentile
+
+# Per-replica totals collected into distributions
+METRICS = ("profit", "cash_end", "served", "lost_queue", "lost_stock", "lost_patience")
+
+# Set in each worker process by _init_worker
+_worker_game = None
+_worker_queue = None
+_worker_stop = None
+
+# Seconds to wait for a result before checking whether a worker failed
+_POLL_SECONDS = 0.5
+
+
+def _init_worker(game_bytes, results, stop):
+    """Receive the configured Game, the results queue and the stop flag once per worker."""
+    global _worker_game, _worker_queue, _worker_stop
+    _worker_game = game_bytes
+    _worker_queue = results
+    _worker_stop = stop
+    # Results nobody will read must not keep the worker from exiting
+    results.cancel_join_thread()
+
+
+def _run_replicas(seeds, days, turns):
+    # Each day's summary is sent as soon as it is simulated; None ends a replica
+    for seed in seeds:
+        game = pickle.loads(_worker_game)
+        game.reseed(seed)
+        for _ in range(days):
+            if _worker_stop.is_set():
+                return
+            _worker_queue.put((seed, game.run_day(turns)))
+            game.start_new_day()
+        _worker_queue.put((seed, None))
+
+
+def _chunks(seq, n):
+    size = max(1, math.ceil(len(seq) / n))
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+
+def iter_montecarlo_days(game, replicas, days, seed=0, workers=None, turns=TURNS_PER_DAY):
+    """
+    Run `replicas` independent copies of `game` for `days` days each.
+
+    Replica i is seeded with seed + i, so any replica can be reproduced on its
+    own. Yields (seed, day_summary) for every simulated day as soon as a
+    worker finishes it, and (seed, None) once a replica's last day is done.
+    Days of one replica arrive in order; replicas interleave. Closing the
+    generator early stops the workers after the day they are simulating.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = [seed + i for i in range(replicas)]
+    game_bytes = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # A few chunks per worker keeps every core busy without paying
+    # inter-process overhead for each replica.
+    chunks = _chunks(seeds, workers * 4)
+
+    ctx = multiprocessing.get_context()
+    results = ctx.Queue()
+    stop = ctx.Event()
+    pool = ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)) or 1,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(game_bytes, results, stop),
+    )
+    futures = []
+    try:
+        futures = [pool.submit(_run_replicas, chunk, days, turns) for chunk in chunks]
+        remaining = len(seeds)
+        while remaining:
+            try:
+                replica_seed, summary = results.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                for fut in futures:
+                    if fut.done() and fut.exception() is not None:
+                        raise fut.exception()
+                continue
+            if summary is None:
+                remaining -= 1
+            yield replica_seed, summary
+    finally:
+        # Finished, failed or abandoned by the caller: stop the workers and
+        # keep the queue drained until they are idle, so none blocks on it
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+        while not all(fut.done() for fut in futures):
+            try:
+                results.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                pass
+        pool.shutdown(wait=True)
+
+
+def iter_montecarlo(game, replicas, days, seed=0, workers=None, turns=TURNS_PER_DAY):
+    """Like iter_montecarlo_days, but yields (seed, day_summaries) once per finished replica."""
+    pending = {}
+    with closing(iter_montecarlo_days(game, replicas, days, seed, workers, turns)) as stream:
+        for replica_seed, summary in stream:
+            if summary is None:
+                yield replica_seed, pending.pop(replica_seed, [])
+            else:
+                pending.setdefault(replica_seed, []).append(summary)
+
+
+def run_montecarlo(game, replicas, days, seed=0, workers=None, on_day=None, turns=TURNS_PER_DAY):
+    """
+    Run a Monte Carlo batch and aggregate the outcome of every replica.
+
+    on_day, if given, is called with (seed, day_summary) for each simulated
+    day as soon as a worker has simulated it.
+    """
+    result = MonteCarloResult(days)
+    pending = {}
+    # closing(): an exception from on_day shuts the workers down right away
+    with closing(iter_montecarlo_days(game, replicas, days, seed, workers, turns)) as stream:
+        for replica_seed, summary in stream:
+            if summary is None:
+                result.add(replica_seed, pending.pop(replica_seed, []))
+                continue
+            if on_day is not None:
+                on_day(replica_seed, summary)
+            pending.setdefault(replica_seed, []).append(summary)
+    return result
+
+
+class MonteCarloResult:
+    """
+    Distributions of per-replica outcomes.
+    profit and the lost/served counters are totals over all days;
+    cash_end is the cash left after the last day.
+    """
+    def __init__(self, days):
+        self.days = days
+        self.seeds = []
+        self.distributions = {m: [] for m in METRICS}
+
+    def add(self, seed, summaries):
+        self.seeds.append(seed)
+        for metric in METRICS:
+            if metric == "cash_end":
+                value = summaries[-1]["cash_end"] if summaries else 0.0
+            else:
+                value = sum(s[metric] for s in summaries)
+            self.distributions[metric].append(value)
+
+    def summary(self):
+        """Mean, standard deviation and P10/P50/P90 for every metric."""
+        out = {}
+        for metric, values in self.distributions.items():
+            ordered = sorted(values)
+            out[metric] = {
+                "mean": statistics.fmean(values) if values else 0.0,
+                "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+                "p10": percentile(ordered, 0.10),
+                "p50": percentile(ordered, 0.50),
+                "p90": percentile(ordered, 0.90),
+            }
+        return out
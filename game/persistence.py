@@ -0,0 +1,360 @@
+"""
+Compact binary save format for Game state.
+
+Layout: a fixed header (magic, format version, day, cash, venue) followed by
+a zlib-compressed body: daily scalars, random stream positions, stock counts
+and perishable lots, menu, staff, loans (payments made so far), the venue
+line and the supplier market. Ingredients, staff, loans and venues are
+written as indexes into the catalogs in game.utils.constants, never as
+pickled objects.
+"""
+import os
+import struct
+import zlib
+from array import array
+
+from .game import Game
+from .models.drink import Drink
+from .models.loan import Loan
+from .models.staff import Staff
+from .models.venue import Stand, Truck, Store
+from .systems.rng import STREAMS
+from .utils.constants import INGREDIENTS, EMPLOYEE_POOL, LOAN_OPTIONS, CUP_REGULAR, CUP_TALL, STRAW, SEAL
+
+MAGIC = b"BOBA"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHIdB")
+_SCALARS = "6dBBBq"
+
+VENUES = (Stand, Truck, Store)
+SIZES = ("regular", "tall")
+MODES = ("turns", "events")
+ENGINES = ("python", "numpy")
+
+_INGREDIENT_IDS = {ing: i for i, ing in enumerate(INGREDIENTS)}
+_POOL_IDS = {e.name: i for i, e in enumerate(EMPLOYEE_POOL)}
+_LOAN_IDS = {opt.name: i for i, opt in enumerate(LOAN_OPTIONS)}
+
+# Staff id meaning "record stored inline" (e.g. the Owner)
+_INLINE_STAFF = 0xFF
+
+_U64 = (1 << 64) - 1
+
+# Days of supplier price history kept in a save (the market only needs today)
+SAVED_PRICE_HISTORY_DAYS = 90
+
+# Fast zlib level: prices barely compress further, and saves happen every day
+_ZLIB_LEVEL = 1
+
+
+class SaveFormatError(ValueError):
+    pass
+
+
+# -------------------------------------------------------
+# Low-level writer / reader
+# -------------------------------------------------------
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, fmt, *values):
+        self.parts.append(struct.pack("<" + fmt, *values))
+
+    def text(self, s):
+        data = s.encode("utf-8")
+        self.pack("H", len(data))
+        self.parts.append(data)
+
+    def array(self, arr):
+        self.pack("I", len(arr))
+        self.parts.append(arr.tobytes())
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        st = struct.Struct("<" + fmt)
+        values = st.unpack_from(self.data, self.pos)
+        self.pos += st.size
+        return values
+
+    def text(self):
+        (n,) = self.unpack("H")
+        s = bytes(self.data[self.pos:self.pos + n]).decode("utf-8")
+        self.pos += n
+        return s
+
+    def array(self, typecode):
+        (n,) = self.unpack("I")
+        arr = array(typecode)
+        size = n * arr.itemsize
+        arr.frombytes(self.data[self.pos:self.pos + size])
+        self.pos += size
+        return arr
+
+
+def _ingredient_id(ing):
+    try:
+        return _INGREDIENT_IDS[ing]
+    except KeyError:
+        raise SaveFormatError(f"ingredient {ing.name!r} is not in the catalog") from None
+
+
+def _pack_pcg64(w, state):
+    if state["bit_generator"] != "PCG64":
+        raise SaveFormatError(f"cannot save {state['bit_generator']} random state")
+    s, inc = state["state"]["state"], state["state"]["inc"]
+    w.pack("4QBI", s >> 64, s & _U64, inc >> 64, inc & _U64, state["has_uint32"], state["uinteger"])
+
+
+def _unpack_pcg64(r):
+    s_hi, s_lo, inc_hi, inc_lo, has_uint32, uinteger = r.unpack("4QBI")
+    return {
+        "bit_generator": "PCG64",
+        "state": {"state": (s_hi << 64) | s_lo, "inc": (inc_hi << 64) | inc_lo},
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+
+
+def _base_recipe(recipe):
+    """Recipe ingredients without the packaging Recipe adds automatically."""
+    base = dict(recipe.ingredients)
+    cup = CUP_TALL if recipe.size == "tall" else CUP_REGULAR
+    for ing in (cup, STRAW, SEAL):
+        base[ing] -= 1
+        if base[ing] == 0:
+            del base[ing]
+    return base
+
+
+# -------------------------------------------------------
+# Save
+# -------------------------------------------------------
+def dumps(game) -> bytes:
+    w = _Writer()
+
+    seed = game.rng.seed
+    if seed is not None and not (isinstance(seed, int) and 0 <= seed < 2 ** 63):
+        raise SaveFormatError(f"seed {seed!r} cannot be saved (expected an int in [0, 2**63))")
+    w.pack(
+        _SCALARS,
+        game.adBudget, game.adFactor,
+        game.dailyIngredientCost, game.dailyAdSpend,
+        game.dailyLoanPayments, game.opening_cash,
+        MODES.index(game.mode), ENGINES.index(game.turn_engine),
+        seed is not None, seed or 0,
+    )
+
+    # Random streams in use: position only, the buffered uniforms are redrawn on load
+    streams = game.rng.streams()
+    w.pack("B", len(streams))
+    for name, stream in streams.items():
+        gen_state, fill_state, left, block = stream.compact_state()
+        w.pack("BII", STREAMS.index(name), left, block)
+        _pack_pcg64(w, gen_state)
+        if left:
+            _pack_pcg64(w, fill_state)
+
+    # Stock: catalog ids + counts
+    w.array(array("H", (_ingredient_id(ing) for ing in game.stock.ingredients)))
+    w.array(array("q", (game.stock[ing] for ing in game.stock.ingredients)))
+
+    lots = [(ing, lot) for ing in game.stock.ingredients for lot in game.stock.lots(ing)]
+    w.pack("I", len(lots))
+    for ing, (expires, units, unit_cost) in lots:
+        w.pack("HIqd", _ingredient_id(ing), expires, units, unit_cost)
+
+    # Menu
+    menu_index = {id(d): i for i, d in enumerate(game.menu)}
+    w.pack("H", len(game.menu))
+    for drink in game.menu:
+        w.text(drink.name)
+        w.pack("ddB", drink.basePrice, drink.desirability, SIZES.index(drink.recipe.size))
+        base = _base_recipe(drink.recipe)
+        w.pack("B", len(base))
+        for ing, qty in base.items():
+            w.pack("HH", _ingredient_id(ing), qty)
+
+    # Staff
+    w.pack("H", len(game.employees))
+    for emp in game.employees:
+        idx = _POOL_IDS.get(emp.name)
+        if idx is not None and EMPLOYEE_POOL[idx] is emp:
+            w.pack("B", idx)
+        else:
+            w.pack("B", _INLINE_STAFF)
+            w.text(emp.name)
+            w.pack("dHHH", emp.wage, emp.capacity, emp.charm, emp.reliability)
+
+    # Loans
+    w.pack("H", len(game.loans))
+    for loan in game.loans:
+        w.pack("BI", _LOAN_IDS[loan.name], loan.day)
+
+    # Venue line (drinks by menu index; drinks no longer on the menu are dropped)
+    line = [c for c in game.venue.line if id(c.desiredDrink) in menu_index]
+    w.pack("H", len(line))
+    for cust in line:
+        w.pack("hHd", cust.patience, menu_index[id(cust.desiredDrink)], cust.maxAfford)
+
+    # Supplier market: today's walk state and the most recent days' prices
+    market = game.market
+    w.pack("B", market is not None)
+    if market is not None:
+        import numpy as np   # a market exists, so NumPy is already loaded
+
+        recent = slice(-SAVED_PRICE_HISTORY_DAYS, None)
+        w.pack("I", market.day)
+        w.array(array("H", (_ingredient_id(ing) for ing in market.ingredients)))
+        w.array(array("d", market._dev.tobytes()))
+        w.array(array("I", market.days[recent]))
+        # Prices are rounded to 3 decimals, so they pack exactly as integer thousandths
+        for history in (market.bulk_history, market.retail_history):
+            w.array(array("i", np.rint(np.asarray(history[recent]) * 1000).astype(np.int32).tobytes()))
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, game.day, game.cash, VENUES.index(type(game.venue)))
+    return header + zlib.compress(w.getvalue(), _ZLIB_LEVEL)
+
+
+def save_game(game, path):
+    """Write a save file atomically (safe for autosaving)."""
+    data = dumps(game)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------------
+# Load
+# -------------------------------------------------------
+def _read_header(data):
+    if len(data) < _HEADER.size:
+        raise SaveFormatError("file too short")
+    magic, version, day, cash, venue = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise SaveFormatError("not a Boba Tycoon save")
+    if version != FORMAT_VERSION:
+        raise SaveFormatError(f"unsupported save format {version} (expected {FORMAT_VERSION})")
+    if venue >= len(VENUES):
+        raise SaveFormatError(f"unknown venue {venue}")
+    return version, day, cash, venue
+
+
+def peek_save(path):
+    """Read only the header of a save: cheap enough to list many checkpoints."""
+    with open(path, "rb") as f:
+        version, day, cash, venue = _read_header(f.read(_HEADER.size))
+    return {"version": version, "day": day, "cash": cash, "venue": VENUES[venue]().name}
+
+
+def loads(data) -> Game:
+    try:
+        return _decode(data)
+    except SaveFormatError:
+        raise
+    except (zlib.error, struct.error, IndexError, KeyError, UnicodeDecodeError, ValueError) as e:
+        # Truncated or damaged body: report it like any other unreadable save
+        raise SaveFormatError(f"corrupt save file ({e})") from e
+
+
+def _decode(data):
+    _, day, cash, venue_code = _read_header(data)
+    r = _Reader(zlib.decompress(memoryview(data)[_HEADER.size:]))
+
+    (ad_budget, ad_factor, ingredient_cost, ad_spend, loan_payments, opening_cash,
+     mode, engine, has_seed, seed) = r.unpack(_SCALARS)
+
+    game = Game(turn_engine=ENGINES[engine], seed=seed if has_seed else None, mode=MODES[mode])
+    game.day = day
+    game.cash = cash
+    game.adBudget = ad_budget
+    game.adFactor = ad_factor
+    game.dailyIngredientCost = ingredient_cost
+    game.dailyAdSpend = ad_spend
+    game.dailyLoanPayments = loan_payments
+    game.opening_cash = opening_cash
+
+    (n,) = r.unpack("B")
+    for _ in range(n):
+        idx, left, block = r.unpack("BII")
+        gen_state = _unpack_pcg64(r)
+        fill_state = _unpack_pcg64(r) if left else None
+        game.rng.stream(STREAMS[idx]).restore_compact_state(gen_state, fill_state, left, block)
+
+    ids = r.array("H")
+    qty = r.array("q")
+    for i, q in zip(ids, qty):
+        game.stock[INGREDIENTS[i]] = q
+
+    (n,) = r.unpack("I")
+    for _ in range(n):
+        ing_id, expires, units, unit_cost = r.unpack("HIqd")
+        game.stock.add_lot(INGREDIENTS[ing_id], units, expires, unit_cost)
+
+    menu = []
+    (n,) = r.unpack("H")
+    for _ in range(n):
+        name = r.text()
+        price, desirability, size = r.unpack("ddB")
+        (k,) = r.unpack("B")
+        recipe = {}
+        for _ in range(k):
+            ing_id, q = r.unpack("HH")
+            recipe[INGREDIENTS[ing_id]] = q
+        drink = Drink(name, recipe, basePrice=price, baseDesirability=0, size=SIZES[size])
+        drink.desirability = desirability
+        menu.append(drink)
+    game.menu = menu
+
+    employees = []
+    (n,) = r.unpack("H")
+    for _ in range(n):
+        (idx,) = r.unpack("B")
+        if idx == _INLINE_STAFF:
+            name = r.text()
+            wage, capacity, charm, reliability = r.unpack("dHHH")
+            employees.append(Staff(name, wage=wage, capacity=capacity, charm=charm, reliability=reliability))
+        else:
+            employees.append(EMPLOYEE_POOL[idx])
+    game.employees = employees
+
+    (n,) = r.unpack("H")
+    for _ in range(n):
+        idx, payments_made = r.unpack("BI")
+        loan = Loan(LOAN_OPTIONS[idx])
+        loan.day = payments_made
+        game.loans.append(loan)
+
+    game.venue = VENUES[venue_code]()
+    (n,) = r.unpack("H")
+    for _ in range(n):
+        patience, drink_idx, max_afford = r.unpack("hHd")
+        game.venue.line.push(patience, menu[drink_idx], max_afford)
+
+    (has_market,) = r.unpack("B")
+    if has_market:
+        from .systems.market import restore_market   # imports NumPy
+        (market_day,) = r.unpack("I")
+        ingredients = [INGREDIENTS[i] for i in r.array("H")]
+        dev = r.array("d")
+        days = r.array("I")
+        bulk = r.array("i")
+        retail = r.array("i")
+        game.market = restore_market(ingredients, market_day, dev, days, bulk, retail)
+
+    return game
+
+
+def load_game(path) -> Game:
+    with open(path, "rb") as f:
+        return loads(f.read())
@@ -1,20 +1,33 @@
 import random
-from ..utils.math_utils import poisson
-from ..models.customer import Customer
+from ..utils.math_utils import poisson, poisson_many
+from ..models.customer import random_budget
 
-def generate_arrivals(venue, multiplier):
+def generate_arrivals(venue, multiplier, rng=random):
     lam = venue.footTraffic * (1 + multiplier)
-    return poisson(lam)
+    return poisson(lam, rng)
+
+def generate_arrivals_many(venue, multiplier, turns, rng=random):
+    """Arrival counts for `turns` consecutive turns in one batched call."""
+    lam = venue.footTraffic * (1 + multiplier)
+    return poisson_many([lam] * turns, rng)
 
 def enqueue_customers(game, arrivals):
+    """
+    Place arriving customers in the venue line.
+    Returns the number turned away because the line was full.
+    """
+    line = game.venue.line
+    patience = game.venue.basePatience
+    budgets = game.rng.budget
+    lost_queue = 0
+
     for _ in range(arrivals):
-        cust = Customer(game.venue.basePatience)
-        drink = game.pickDrink(cust)
+        max_afford = random_budget(budgets)
+        drink = game.pick_drink(max_afford)
         if drink is None:
             continue
-        cust.desiredDrink = drink
 
-        if len(game.venue.line) < game.venue.maxLine:
-            game.venue.line.append(cust)
-        else:
-            game.lostQueue += 1
\ No newline at end of file
+        if not line.push(patience, drink, max_afford):
+            lost_queue += 1
+
+    return lost_queue
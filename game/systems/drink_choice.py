@@ -0,0 +1,29 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class DrinkChooser:
+    """
+    Precomputed index for picking a customer's drink.
+
+    Drinks are sorted by price, so the affordable ones for a budget are a
+    prefix found by bisection. Cumulative desirability weights over that order
+    turn each pick into a second bisection on one uniform draw, the same
+    sampling rule random.choices uses.
+    """
+    def __init__(self, menu, employees):
+        total_charm = sum(e.charm for e in employees)
+        boost = 1 + 0.05 * total_charm
+
+        self.drinks = sorted(menu, key=lambda d: d.basePrice)
+        self.prices = [d.basePrice for d in self.drinks]
+        self.cum_weights = list(accumulate(d.desirability * boost for d in self.drinks))
+
+    def pick(self, max_afford, rng=random):
+        n = bisect_right(self.prices, max_afford)
+        if n == 0:
+            return None
+
+        total = self.cum_weights[n - 1]
+        return self.drinks[bisect_right(self.cum_weights, rng.random() * total, 0, n - 1)]
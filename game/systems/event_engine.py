@@ -0,0 +1,141 @@
+import heapq
+import math
+from collections import deque
+
+from ..config import MINUTES_PER_TURN, TURNS_PER_DAY
+from ..models.customer import random_budget
+
+# Event kinds, ordered so simultaneous events resolve deterministically:
+# a server freeing up is handled before a new arrival, and an arrival
+# before a patience expiry at the same instant.
+SERVER_FREE = 0
+ARRIVAL = 1
+EXPIRE = 2
+
+
+def run_day_events(game, turns=TURNS_PER_DAY):
+    """
+    Discrete-event version of a business day.
+
+    Time is continuous (minutes after opening). Customers arrive as a
+    Poisson process with the same hourly rate as the turn engine; each
+    employee is a server who makes `capacity` drinks per turn; customers
+    give up after basePatience turns. The day jumps from event to event, so
+    its cost grows with the number of customers, not with time resolution.
+
+    A drink is paid for and its ingredients used when its preparation
+    starts. Customers still waiting at closing stay in venue.line with their
+    remaining patience.
+
+    Returns:
+        stats, revenue, hour_sales (same shapes as the turn loop)
+    """
+    venue = game.venue
+    close = turns * MINUTES_PER_TURN
+    patience_span = venue.basePatience * MINUTES_PER_TURN
+    rate = venue.footTraffic * (1 + game.adFactor) / MINUTES_PER_TURN
+
+    arrivals_rng = game.rng.arrivals
+    budgets = game.rng.budget
+
+    stats = {"served": 0, "lost_queue": 0, "lost_stock": 0, "lost_patience": 0}
+    revenue = 0.0
+    hour_sales = {
+        f"{8 + m // 60:02d}:00": {}
+        for m in range(0, close, MINUTES_PER_TURN)
+    }
+
+    events = []
+    seq = 0
+
+    def schedule(when, kind, payload=None):
+        nonlocal seq
+        heapq.heappush(events, (when, kind, seq, payload))
+        seq += 1
+
+    # Waiting customers: FIFO of ids plus the live set (expired ids are
+    # skipped lazily when they reach the front).
+    waiting_order = deque()
+    waiting = {}          # cid -> (deadline, drink)
+    next_cid = 0
+
+    def enqueue(deadline, drink):
+        nonlocal next_cid
+        cid = next_cid
+        next_cid += 1
+        waiting_order.append(cid)
+        waiting[cid] = (deadline, drink)
+        schedule(deadline, EXPIRE, cid)
+
+    # Customers carried over from yesterday keep their remaining patience
+    for cust in venue.line:
+        enqueue(cust.patience * MINUTES_PER_TURN, cust.desiredDrink)
+    venue.line.clear()
+
+    # Each employee is a server; service time is one turn / capacity
+    service_time = [MINUTES_PER_TURN / e.capacity for e in game.employees if e.capacity > 0]
+    free_servers = list(range(len(service_time)))
+    heapq.heapify(free_servers)
+
+    def start_service(now):
+        nonlocal revenue
+        while free_servers and waiting:
+            cid = waiting_order.popleft()
+            entry = waiting.pop(cid, None)
+            if entry is None:
+                continue        # already gave up
+
+            drink = entry[1]
+            if not game.stock.can_make(drink):
+                stats["lost_stock"] += 1
+                continue
+
+            game.stock.deduct(drink)
+            game.cash += drink.basePrice
+            revenue += drink.basePrice
+            stats["served"] += 1
+
+            sales = hour_sales[f"{8 + int(now // 60):02d}:00"]
+            sales[drink.name] = sales.get(drink.name, 0) + 1
+
+            server = heapq.heappop(free_servers)
+            schedule(now + service_time[server], SERVER_FREE, server)
+
+    if rate > 0:
+        schedule(arrivals_rng.expovariate(rate), ARRIVAL)
+
+    while events:
+        now, kind, _, payload = heapq.heappop(events)
+        if now >= close:
+            break
+
+        if kind == ARRIVAL:
+            schedule(now + arrivals_rng.expovariate(rate), ARRIVAL)
+
+            max_afford = random_budget(budgets)
+            drink = game.pick_drink(max_afford)
+            if drink is not None:
+                if len(waiting) < venue.maxLine:
+                    enqueue(now + patience_span, drink)
+                else:
+                    stats["lost_queue"] += 1
+
+        elif kind == SERVER_FREE:
+            heapq.heappush(free_servers, payload)
+
+        elif kind == EXPIRE:
+            if waiting.pop(payload, None) is not None:
+                stats["lost_patience"] += 1
+
+        start_service(now)
+
+    # Hand whoever is still waiting back to the venue line
+    for cid in waiting_order:
+        entry = waiting.get(cid)
+        if entry is None:
+            continue
+        remaining = math.ceil((entry[0] - close) / MINUTES_PER_TURN)
+        if remaining <= 0 or not venue.line.push(remaining, entry[1]):
+            stats["lost_patience"] += 1
+
+    return stats, revenue, hour_sales
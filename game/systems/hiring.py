@@ -1,4 +1,3 @@
-import random
 from game.utils.constants import EMPLOYEE_POOL
 
 def generate_candidates(game, n=3):
@@ -16,4 +15,4 @@ def generate_candidates(game, n=3):
     # If fewer remaining than needed, reduce n
     n = min(n, len(remaining))
 
-    return random.sample(remaining, k=n)
\ No newline at end of file
+    return game.rng.hiring.sample(remaining, k=n)
\ No newline at end of file
@@ -1,29 +1,270 @@
-import random
+import heapq
+from array import array
+from collections import deque
+from collections.abc import MutableMapping
+
+
+class Stock(MutableMapping):
+    """
+    Ingredient counts stored as one integer vector indexed by Ingredient.id.
+
+    Recipes are compiled once into sparse (ids, quantities) rows against
+    those ids. Slots of ingredients the stock does not hold stay at 0 and
+    are not part of the mapping. Behaves like the {Ingredient: count} dict
+    it replaces.
+
+    copy() is copy-on-write: both copies share storage until either one
+    changes a count or adds an ingredient.
+
+    Every change is also accumulated per ingredient until drain_deltas(),
+    so callers can see what changed without diffing the whole stock.
+
+    Purchases can be received as lots with an expiry day. Each ingredient
+    keeps its lots in a deque in expiry order, and consumption draws from
+    the soonest-expiring lot first (FEFO), then from units without an
+    expiry (e.g. starting stock). A min-heap of lot expiry days lets
+    expire() find spoiled lots in O(log lots) each.
+    """
+    def __init__(self, ingredients=(), counts=None):
+        self.ingredients = []   # held ingredients, in order of first use
+        self.slots = []         # Ingredient.id -> Ingredient, or None if not held
+        self.qty = array("q")
+        self._compiled = {}
+        self._shared = False
+        self._deltas = {}
+        self._dirty = set()
+        self._lots = {}      # id -> deque of [expiry_day, units, unit_cost]
+        self._expiry = []    # heap of (expiry_day, seq, id)
+        self._lot_seq = 0
+
+        for ing in ingredients:
+            self.id_of(ing)
+        if counts:
+            self.update(counts)
+
+    def id_of(self, ing):
+        idx = ing.id
+        slots = self.slots
+        if idx >= len(slots) or slots[idx] is None:
+            if self._shared:
+                self._own()
+                slots = self.slots
+            if idx >= len(slots):
+                missing = idx + 1 - len(slots)
+                slots.extend([None] * missing)
+                self.qty.extend([0] * missing)
+            slots[idx] = ing
+            self.ingredients.append(ing)
+        return idx
+
+    def _held(self, ing):
+        idx = ing.id
+        return idx < len(self.slots) and self.slots[idx] is not None
+
+    # -------------------------------------------------------
+    # Mapping interface
+    # -------------------------------------------------------
+    def __getitem__(self, ing):
+        idx = ing.id
+        if idx < len(self.slots) and self.slots[idx] is not None:
+            return self.qty[idx]
+        raise KeyError(ing)
+
+    def get(self, ing, default=None):
+        idx = ing.id
+        if idx < len(self.slots) and self.slots[idx] is not None:
+            return self.qty[idx]
+        return default
+
+    def __contains__(self, ing):
+        return self._held(ing)
+
+    def __setitem__(self, ing, value):
+        idx = self.id_of(ing)
+        self.adjust(idx, value - self.qty[idx])
+
+    def __delitem__(self, ing):
+        raise TypeError("ingredients cannot be removed from Stock; set them to 0")
+
+    def __iter__(self):
+        return iter(self.ingredients)
+
+    def __len__(self):
+        return len(self.ingredients)
+
+    def copy(self):
+        other = Stock.__new__(Stock)
+        other.__dict__.update(self.__dict__)
+        other._deltas = {}
+        other._dirty = set()
+        self._shared = other._shared = True
+        return other
+
+    def _own(self):
+        """Take private copies of storage shared with another Stock."""
+        self.ingredients = list(self.ingredients)
+        self.slots = list(self.slots)
+        self.qty = array("q", self.qty)
+        self._compiled = dict(self._compiled)
+        self._lots = {i: deque([lot[:] for lot in lots]) for i, lots in self._lots.items() if lots}
+        self._expiry = list(self._expiry)
+        self._shared = False
+
+    def __getstate__(self):
+        # Keyed by ingredient, not slot: an ingredient unpickled in another
+        # process may get a different id there
+        return {
+            "counts": [(ing, self.qty[ing.id]) for ing in self.ingredients],
+            "lots": [(ing, self.lots(ing)) for ing in self.ingredients],
+        }
+
+    def __setstate__(self, state):
+        self.__init__()
+        for ing, count in state["counts"]:
+            self.qty[self.id_of(ing)] = count
+        for ing, lots in state["lots"]:
+            for expires, units, unit_cost in lots:
+                self.add_lot(ing, units, expires, unit_cost)
+
+    # -------------------------------------------------------
+    # Compiled recipe operations
+    # -------------------------------------------------------
+    def compile(self, drink):
+        """Sparse (ids, quantities) row for a drink's recipe."""
+        entry = self._compiled.get(id(drink.recipe))
+        if entry is None:
+            if self._shared:
+                self._own()
+            ids = tuple(self.id_of(ing) for ing, _ in drink.recipe.items())
+            qtys = tuple(qty for _, qty in drink.recipe.items())
+            # Keep the recipe alive so its id() cannot be reused
+            entry = self._compiled[id(drink.recipe)] = (drink.recipe, ids, qtys)
+        return entry[1], entry[2]
+
+    def adjust(self, idx, delta):
+        """Add delta to the ingredient with id idx."""
+        if self._shared:
+            self._own()
+        self.qty[idx] += delta
+        if delta < 0 and self._lots:
+            lots = self._lots.get(idx)
+            if lots:
+                self._consume(lots, -delta)
+        deltas = self._deltas
+        deltas[idx] = deltas.get(idx, 0) + delta
+        self._dirty.add(idx)
+
+    # -------------------------------------------------------
+    # Lots and expiry
+    # -------------------------------------------------------
+    def receive(self, ing, units, expires, unit_cost=0.0):
+        """Add `units` of an ingredient as a lot that spoils on day `expires`."""
+        idx = self.id_of(ing)
+        self.adjust(idx, units)
+        self.add_lot(ing, units, expires, unit_cost)
+
+    def add_lot(self, ing, units, expires, unit_cost=0.0):
+        """Track `units` already in stock as a lot (e.g. when loading a save)."""
+        if units <= 0:
+            return
+        if self._shared:
+            self._own()
+        idx = self.id_of(ing)
+        lots = self._lots.get(idx)
+        if lots is None:
+            lots = self._lots[idx] = deque()
+
+        lot = [expires, units, unit_cost]
+        if not lots or lots[-1][0] <= expires:
+            lots.append(lot)
+        else:
+            # Out-of-order expiry (rare): keep the deque sorted
+            pos = next(i for i, other in enumerate(lots) if other[0] > expires)
+            lots.insert(pos, lot)
+
+        self._lot_seq += 1
+        heapq.heappush(self._expiry, (expires, self._lot_seq, idx))
+
+    def lots(self, ing):
+        """[(expiry_day, units, unit_cost)] for an ingredient, soonest first."""
+        return [tuple(lot) for lot in self._lots.get(ing.id, ())]
+
+    def lot_count(self):
+        return sum(len(lots) for lots in self._lots.values())
+
+    def _consume(self, lots, units):
+        while units and lots:
+            lot = lots[0]
+            if lot[1] > units:
+                lot[1] -= units
+                return
+            units -= lot[1]
+            lots.popleft()
+
+    def expire(self, day):
+        """
+        Remove every lot expiring on or before `day`.
+        Returns {Ingredient: (units spoiled, value at purchase cost)}.
+        """
+        spoiled = {}
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= day:
+            if self._shared:
+                self._own()
+                expiry = self._expiry
+            _, _, idx = heapq.heappop(expiry)
+            lots = self._lots.get(idx)
+            # Lots already used up leave stale heap entries; they find nothing here
+            while lots and lots[0][0] <= day:
+                _, units, unit_cost = lots[0]
+                self.adjust(idx, -units)   # consumes exactly this head lot
+                ing = self.slots[idx]
+                total, value = spoiled.get(ing, (0, 0.0))
+                spoiled[ing] = (total + units, value + units * unit_cost)
+        return spoiled
+
+    def take_dirty(self):
+        """Ingredients changed since the last call (for views)."""
+        dirty, self._dirty = self._dirty, set()
+        slots = self.slots
+        return {slots[i] for i in tuple(dirty)}
+
+    def drain_deltas(self):
+        """{Ingredient: net change} since the last drain, then start over."""
+        slots = self.slots
+        changes = {slots[i]: d for i, d in self._deltas.items() if d}
+        self._deltas = {}
+        return changes
+
+    def max_producible(self, drink):
+        """How many of this drink the current stock can make."""
+        ids, qtys = self.compile(drink)
+        qty = self.qty
+        return min(qty[i] // q for i, q in zip(ids, qtys) if q > 0)
+
+    def can_make(self, drink, k=1):
+        ids, qtys = self.compile(drink)
+        qty = self.qty
+        return all(qty[i] >= q * k for i, q in zip(ids, qtys))
+
+    def can_make_many(self, drinks):
+        """can_make for each drink against the current stock."""
+        return [self.can_make(d) for d in drinks]
+
+    def deduct(self, drink, k=1):
+        ids, qtys = self.compile(drink)
+        for i, q in zip(ids, qtys):
+            self.adjust(i, -q * k)
+
 
 def can_make(drink, stock):
+    if isinstance(stock, Stock):
+        return stock.can_make(drink)
     return all(stock.get(ing, 0) >= qty for ing, qty in drink.recipe.items())
 
 def deduct_ingredients(drink, stock):
+    if isinstance(stock, Stock):
+        stock.deduct(drink)
+        return
     for ing, qty in drink.recipe.items():
         stock[ing] -= qty
-
-def generate_offers(ingredients):
-    """
-    Create bulk & retail offers for every ingredient for this morning.
-    Returns a dict: {ingredient: {"bulk": {...}, "retail": {...}}}
-    """
-    offers = {}
-    for ing in ingredients:
-        base = ing.unit_cost
-        offers[ing] = {
-            "bulk":   {
-                "min": 200,
-                "unit": round(base * random.uniform(0.7, 0.85), 3)
-            },
-            "retail": {
-                "min": 1,
-                "unit": round(base * random.uniform(1.05, 1.20), 3)
-            }
-        }
-    return offers
-
@@ -0,0 +1,99 @@
+from array import array
+from functools import lru_cache
+
+# Schedules are built this many days at a time
+SCHEDULE_CHUNK = 64
+
+# Projections give up on loans not paid off within this many days
+MAX_PROJECTION_DAYS = 3650
+
+
+class LoanSchedule:
+    """
+    Day-by-day amortization table for one loan option.
+
+    Each day a fixed share of the original principal is paid (capped at the
+    balance), then interest compounds on what is left. payments[d] is the
+    payment made on day d of the loan and balances[d] the balance after it
+    (before day 0 the balance is the principal). The table is built once and
+    shared by every loan of the same terms; it grows on demand for loans
+    that take unusually long to pay off.
+    """
+    __slots__ = ("principal", "interest_rate", "payment", "payments", "balances", "payoff_day")
+
+    def __init__(self, principal, interest_rate, payment):
+        self.principal = principal
+        self.interest_rate = interest_rate
+        self.payment = payment
+        self.payments = array("d")
+        self.balances = array("d")
+        self.payoff_day = None   # days until paid off, once known
+        self._extend(SCHEDULE_CHUNK)
+
+    def _extend(self, days):
+        balance = self.balances[-1] if self.balances else self.principal
+        growth = 1 + self.interest_rate
+        for _ in range(days):
+            if self.payoff_day is not None:
+                return
+            paid = min(self.payment, balance)
+            balance -= paid
+            if balance > 0:
+                balance *= growth
+            self.payments.append(paid)
+            self.balances.append(balance)
+            if balance <= 0:
+                self.payoff_day = len(self.payments)
+
+    def _ensure(self, day):
+        while day >= len(self.payments) and self.payoff_day is None:
+            self._extend(SCHEDULE_CHUNK)
+
+    def __reduce__(self):
+        # Unpickle as the shared table for these terms
+        return _schedule, (self.principal, self.interest_rate, self.payment)
+
+    # -------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------
+    def payment_on(self, day):
+        self._ensure(day)
+        return self.payments[day] if day < len(self.payments) else 0.0
+
+    def balance_after(self, day):
+        """Balance once `day` payments have been made."""
+        if day <= 0:
+            return self.principal
+        self._ensure(day - 1)
+        return self.balances[min(day, len(self.balances)) - 1]
+
+    # -------------------------------------------------------
+    # Projections
+    # -------------------------------------------------------
+    def projection(self, start_day=0):
+        """
+        What is left to pay once `start_day` payments have been made: days
+        until payoff, total still to pay, the interest in it, and the daily
+        payments as a cash-flow list (outflows negative). days and interest
+        are None if the loan is not paid off within MAX_PROJECTION_DAYS.
+        """
+        self._ensure(MAX_PROJECTION_DAYS - 1)
+        payments = self.payments[start_day:MAX_PROJECTION_DAYS]
+        total = sum(payments)
+        paid_off = self.payoff_day is not None and self.payoff_day <= MAX_PROJECTION_DAYS
+        return {
+            "days": len(payments) if paid_off else None,
+            "total_paid": total,
+            "interest": total - self.balance_after(start_day) if paid_off else None,
+            "cash_flow": [-p for p in payments],
+        }
+
+
+@lru_cache(maxsize=None)
+def _schedule(principal, interest_rate, payment):
+    return LoanSchedule(principal, interest_rate, payment)
+
+
+def amortization_schedule(option):
+    """Shared schedule for a LoanOption (one per distinct set of terms)."""
+    return _schedule(option.amount, option.interest_rate, option.amount * option.payback_rate)
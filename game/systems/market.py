@@ -0,0 +1,139 @@
+import numpy as np
+
+# Price multipliers on an ingredient's unit cost: long-run means and the
+# band they are kept in (bulk always stays below retail)
+BULK_MEAN, BULK_BAND = 0.775, (0.60, 0.95)
+RETAIL_MEAN, RETAIL_BAND = 1.125, (1.00, 1.35)
+
+# Day-to-day persistence of a price deviation (0 = none, 1 = random walk)
+# and the size of each day's shock, in log-price terms
+REVERSION = 0.8
+VOLATILITY = 0.04
+
+BULK_MIN = 200
+RETAIL_MIN = 1
+
+
+class SupplierMarket:
+    """
+    Bulk and retail prices for every ingredient, moving once per day.
+
+    Each price is the ingredient's unit cost times a multiplier whose log
+    follows a mean-reverting AR(1) walk; all ingredients step together as
+    one NumPy vector. offers(day) advances the walk to `day` and caches that
+    day's offers, so repeated queries within a day are a dict lookup and
+    return the same prices. Every simulated day's prices are kept in the
+    history; copy() shares it copy-on-write, so forking a long campaign
+    stays cheap.
+    """
+    def __init__(self, ingredients, day, rng):
+        self.ingredients = list(ingredients)
+        self.base = np.array([ing.unit_cost for ing in self.ingredients])
+
+        # Start from the walk's stationary distribution
+        spread = VOLATILITY / np.sqrt(1 - REVERSION ** 2)
+        self._dev = spread * rng.generator.standard_normal((2, len(self.ingredients)))
+
+        self.day = day
+        self.days = []
+        self.bulk_history = []
+        self.retail_history = []
+        self._offers = None
+        self._shared = False
+        self._record()
+
+    def copy(self):
+        """
+        Independent copy. History lists are shared until either market
+        records another day (rows themselves are never modified).
+        """
+        other = SupplierMarket.__new__(SupplierMarket)
+        other.__dict__.update(self.__dict__)
+        other._dev = self._dev.copy()
+        self._shared = other._shared = True
+        return other
+
+    # -------------------------------------------------------
+    # Dynamics
+    # -------------------------------------------------------
+    def advance(self, day, rng):
+        """Step the prices forward to `day`, one step per day."""
+        steps = day - self.day
+        if steps <= 0:
+            return
+        shocks = VOLATILITY * rng.generator.standard_normal((steps, 2, len(self.ingredients)))
+        for shock in shocks:
+            self._dev = REVERSION * self._dev + shock
+            self.day += 1
+            self._record()
+        self._offers = None
+
+    def _prices(self):
+        bulk = self.base * np.clip(BULK_MEAN * np.exp(self._dev[0]), *BULK_BAND)
+        retail = self.base * np.clip(RETAIL_MEAN * np.exp(self._dev[1]), *RETAIL_BAND)
+        return np.round(bulk, 3), np.round(retail, 3)
+
+    def _record(self):
+        if self._shared:
+            self.days = list(self.days)
+            self.bulk_history = list(self.bulk_history)
+            self.retail_history = list(self.retail_history)
+            self._shared = False
+        bulk, retail = self._prices()
+        self.days.append(self.day)
+        self.bulk_history.append(bulk)
+        self.retail_history.append(retail)
+
+    # -------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------
+    def offers(self, day, rng):
+        """
+        Offers for `day`, as BuyStockDialog and the purchase planner take them:
+        {ingredient: {"bulk": {"min", "unit"}, "retail": {"min", "unit"}}}
+        """
+        self.advance(day, rng)
+        if self._offers is None:
+            bulk = self.bulk_history[-1].tolist()
+            retail = self.retail_history[-1].tolist()
+            self._offers = {
+                ing: {
+                    "bulk": {"min": BULK_MIN, "unit": b},
+                    "retail": {"min": RETAIL_MIN, "unit": r},
+                }
+                for ing, b, r in zip(self.ingredients, bulk, retail)
+            }
+        return self._offers
+
+    def price_history(self, ing=None):
+        """
+        Recorded prices as (days, bulk, retail) arrays: one row per day, one
+        column per ingredient, or just that ingredient's column.
+        """
+        days = np.array(self.days)
+        bulk = np.array(self.bulk_history)
+        retail = np.array(self.retail_history)
+        if ing is None:
+            return days, bulk, retail
+        col = self.ingredients.index(ing)
+        return days, bulk[:, col], retail[:, col]
+
+
+def restore_market(ingredients, day, dev, days, bulk_history, retail_history):
+    """
+    Rebuild a SupplierMarket from saved state (see game.persistence).
+    Histories are flat int32 buffers of prices in thousandths, one row per
+    entry of `days`.
+    """
+    market = SupplierMarket.__new__(SupplierMarket)
+    market.ingredients = list(ingredients)
+    n = len(market.ingredients)
+    market.base = np.array([ing.unit_cost for ing in market.ingredients])
+    market._dev = np.frombuffer(dev, dtype=np.float64).reshape(2, n).copy()
+    market.day = day
+    market.days = list(days)
+    market.bulk_history = list(np.frombuffer(bulk_history, dtype=np.int32).reshape(-1, n) / 1000)
+    market.retail_history = list(np.frombuffer(retail_history, dtype=np.int32).reshape(-1, n) / 1000)
+    market._offers = None
+    market._shared = False
+    return market
@@ -0,0 +1,181 @@
+import math
+
+# Bisection steps when scaling demand down to fit the budget
+BUDGET_STEPS = 30
+
+
+def bundle_options(offer):
+    """(units, price) of one bulk and one retail bundle for an ingredient's offer."""
+    bulk_min = offer["bulk"]["min"]
+    retail_bundle = max(1, bulk_min // 4)
+    return (
+        (bulk_min, bulk_min * offer["bulk"]["unit"]),
+        (retail_bundle, retail_bundle * offer["retail"]["unit"]),
+    )
+
+
+def cheapest_cover(units, offer):
+    """
+    Cheapest (bulk bundles, retail bundles, cost) buying at least `units`.
+
+    Bulk is the cheaper unit price, so an optimal cart never buys fewer
+    bulk bundles than fit in `units`; the only choice is whether the
+    remainder is topped up with retail bundles or one more bulk bundle.
+    """
+    if units <= 0:
+        return 0, 0, 0.0
+    (bulk_qty, bulk_price), (retail_qty, retail_price) = bundle_options(offer)
+
+    full = units // bulk_qty
+    rest = units - full * bulk_qty
+    retail = math.ceil(rest / retail_qty)
+    best = (full, retail, full * bulk_price + retail * retail_price)
+    if rest:
+        more_bulk = (full + 1) * bulk_price
+        if more_bulk < best[2]:
+            best = (full + 1, 0, more_bulk)
+    return best
+
+
+def ingredient_needs(menu, demand, stock, scale=1.0):
+    """Units to buy per ingredient so `scale` x `demand` cups can be made from stock."""
+    required = {}
+    for drink in menu:
+        cups = demand.get(drink, 0) * scale
+        if cups <= 0:
+            continue
+        for ing, qty in drink.recipe.items():
+            required[ing] = required.get(ing, 0.0) + cups * qty
+    return {
+        ing: math.ceil(units) - stock.get(ing, 0)
+        for ing, units in required.items()
+        if math.ceil(units) > stock.get(ing, 0)
+    }
+
+
+class PurchasePlan:
+    """
+    A cart: lines of (ingredient, vendor, bundles, units, cost).
+    `coverage` is the share of the demand forecast the cart covers.
+    """
+    def __init__(self, lines, coverage):
+        self.lines = lines
+        self.coverage = coverage
+        self.total = sum(line[4] for line in lines)
+
+    def cart(self):
+        """(ingredient, units, cost, vendor) tuples, as BuyStockDialog keeps them."""
+        return [(ing, units, cost, vendor) for ing, vendor, _, units, cost in self.lines]
+
+
+def _cart_for(needs, offers):
+    plan = {}
+    total = 0.0
+    for ing, units in needs.items():
+        bulk, retail, cost = cheapest_cover(units, offers[ing])
+        plan[ing] = (bulk, retail)
+        total += cost
+    return plan, total
+
+
+def _units(counts, offer):
+    (bulk_qty, _), (retail_qty, _) = bundle_options(offer)
+    return counts[0] * bulk_qty + counts[1] * retail_qty
+
+
+def _one_more_cup(drink, required, have, stock, offers):
+    """Retail bundles per ingredient (and their cost) needed to make one more cup."""
+    bundles = {}
+    cost = 0.0
+    for ing, qty in drink.recipe.items():
+        short = math.ceil(required.get(ing, 0.0) + qty) - have.get(ing, stock.get(ing, 0))
+        if short > 0:
+            retail_qty, retail_price = bundle_options(offers[ing])[1]
+            n = math.ceil(short / retail_qty)
+            bundles[ing] = n
+            cost += n * retail_price
+    return bundles, cost
+
+
+def plan_purchases(game, offers, demand=None, budget=None):
+    """
+    Minimum-cost cart that tops stock up to the demand forecast.
+
+    demand maps drinks to expected cups (the cached Monte Carlo forecast's
+    mean if omitted) and budget defaults to the game's cash. Per ingredient
+    the cheapest bulk / retail mix is exact. If the full cart is over budget,
+    demand is scaled down by bisection to the largest share that fits, then
+    leftover cash is spent a cup at a time on the drinks furthest below their
+    forecast, buying only the retail bundles that cup is missing. Ingredients
+    that cannot complete a cup within the budget are never bought.
+    """
+    if demand is None:
+        from game.forecast import forecast_demand   # heavy: only when planning
+        demand = forecast_demand(game).demand(game.menu)
+    if budget is None:
+        budget = game.cash
+    budget = max(0.0, budget)
+
+    menu = list(game.menu)
+    stock = game.stock
+
+    full_needs = ingredient_needs(menu, demand, stock)
+    plan, total = _cart_for(full_needs, offers)
+    coverage = 1.0
+
+    if total > budget:
+        lo, hi = 0.0, 1.0
+        plan, total = {}, 0.0
+        for _ in range(BUDGET_STEPS):
+            mid = (lo + hi) / 2
+            trial, cost = _cart_for(ingredient_needs(menu, demand, stock, mid), offers)
+            if cost <= budget:
+                lo, plan, total = mid, trial, cost
+            else:
+                hi = mid
+        coverage = lo
+
+        # Repair: spend what is left one whole cup at a time, always on the
+        # drink furthest below its forecast, so every bundle bought lets at
+        # least one more cup be made
+        left = budget - total
+        have = {ing: stock.get(ing, 0) + _units(counts, offers[ing]) for ing, counts in plan.items()}
+        cups = {d: demand[d] * lo for d in menu if demand.get(d, 0) > 0}
+        required = {}
+        for drink, planned in cups.items():
+            for ing, qty in drink.recipe.items():
+                required[ing] = required.get(ing, 0.0) + planned * qty
+
+        while True:
+            best = None
+            for drink, planned in cups.items():
+                short = demand[drink] - planned
+                if short <= 0 or (best is not None and short <= best[0]):
+                    continue
+                bundles, cost = _one_more_cup(drink, required, have, stock, offers)
+                if cost <= left:
+                    best = (short, drink, bundles, cost)
+            if best is None:
+                break
+
+            _, drink, bundles, cost = best
+            cups[drink] += 1
+            for ing, qty in drink.recipe.items():
+                required[ing] = required.get(ing, 0.0) + qty
+            for ing, n in bundles.items():
+                bulk, retail = plan.get(ing, (0, 0))
+                plan[ing] = (bulk, retail + n)
+                have[ing] = have.get(ing, stock.get(ing, 0)) + n * bundle_options(offers[ing])[1][0]
+            left -= cost
+
+        wanted = sum(demand[d] for d in cups)
+        coverage = sum(min(c, demand[d]) for d, c in cups.items()) / wanted if wanted else 1.0
+
+    lines = []
+    for ing, (bulk, retail) in plan.items():
+        (bulk_qty, bulk_price), (retail_qty, retail_price) = bundle_options(offers[ing])
+        if bulk:
+            lines.append((ing, "Bulk", bulk, bulk * bulk_qty, bulk * bulk_price))
+        if retail:
+            lines.append((ing, "Retail", retail, retail * retail_qty, retail * retail_price))
+    return PurchasePlan(lines, coverage)
@@ -0,0 +1,110 @@
+import random
+import zlib
+
+# Uniforms generated per refill of a stream's buffer
+BLOCK_SIZE = 4096
+
+# Subsystems that draw random numbers, one independent stream each
+STREAMS = ("arrivals", "budget", "drink", "hiring", "market")
+
+
+class RandomStream(random.Random):
+    """
+    random.Random whose uniforms come from blocks generated by a NumPy
+    Generator. Every helper built on random() (uniform, choices, sample,
+    expovariate, ...) works unchanged, and most draws are a list pop.
+    """
+    def __init__(self, seed=None, block=BLOCK_SIZE):
+        import numpy as np   # deferred: keeps `import game` light for the GUI
+        self._gen = np.random.Generator(np.random.PCG64(seed))
+        self._block = block
+        self._buf = []
+        self._pop = self._buf.pop
+        self._fill_state = None   # generator state the buffer was drawn from
+        super().__init__()
+
+    def random(self):
+        try:
+            return self._pop()
+        except IndexError:
+            self._fill_state = self._gen.bit_generator.state
+            self._buf = self._gen.random(self._block).tolist()
+            self._pop = self._buf.pop
+            return self._pop()
+
+    def block(self, n):
+        """n uniforms as a NumPy array, for vectorized callers."""
+        return self._gen.random(n)
+
+    @property
+    def generator(self):
+        """The underlying NumPy Generator (shares state with this stream)."""
+        return self._gen
+
+    def getstate(self):
+        return self._gen.bit_generator.state, list(self._buf), self._block, self._fill_state
+
+    def setstate(self, state):
+        gen_state, buf, block, fill_state = state
+        self._gen.bit_generator.state = gen_state
+        self._buf = list(buf)
+        self._pop = self._buf.pop
+        self._block = block
+        self._fill_state = fill_state
+
+    def compact_state(self):
+        """
+        (generator state, fill state, uniforms left, block size): the
+        stream's position without its buffer, which is redrawn from the
+        fill state on restore. Used by save files.
+        """
+        left = len(self._buf)
+        return self._gen.bit_generator.state, self._fill_state if left else None, left, self._block
+
+    def restore_compact_state(self, gen_state, fill_state, left, block):
+        self._block = block
+        if left:
+            # Uniforms are popped from the end, so the unused ones are the first `left`
+            self._gen.bit_generator.state = fill_state
+            self._buf = self._gen.random(block).tolist()[:left]
+        else:
+            self._buf = []
+        self._pop = self._buf.pop
+        self._fill_state = fill_state
+        self._gen.bit_generator.state = gen_state
+
+
+class RngService:
+    """
+    Named, independently seeded random streams for one Game.
+
+    Streams are derived from a single seed, so a run is reproducible from
+    that seed, and each subsystem draws from its own stream so changing one
+    (e.g. more arrivals) does not shift the numbers another sees.
+    Access a stream as `rng.arrivals` or `rng.stream("arrivals")`.
+    """
+    def __init__(self, seed=None):
+        self.seed = seed
+        self._root = None   # created with the first stream, keeping forks cheap
+
+    def stream(self, name):
+        stream = self.__dict__.get(name)
+        if stream is None:
+            import numpy as np
+            if self._root is None:
+                self._root = np.random.SeedSequence(self.seed)
+            child = np.random.SeedSequence(
+                self._root.entropy,
+                spawn_key=(zlib.crc32(name.encode()),),
+            )
+            stream = self.__dict__[name] = RandomStream(child)
+        return stream
+
+    def streams(self):
+        """{name: stream} for the streams drawn from so far."""
+        return {name: self.__dict__[name] for name in STREAMS if name in self.__dict__}
+
+    def __getattr__(self, name):
+        if name in STREAMS:
+            return self.stream(name)
+        raise AttributeError(name)
@@ -1,5 +1,4 @@
 from .inventory import can_make, deduct_ingredients
-from collections import deque
 
 def process_turn(game):
     """
@@ -10,7 +9,6 @@ def process_turn(game):
     """
     served = 0
     lostStock = 0
-    lostPatience = 0
     drinks_served_list = []   # NEW — track each drink sold
 
     # 1. SERVING
@@ -18,23 +16,15 @@ def process_turn(game):
     to_serve = min(capacity, len(game.venue.line))
 
     for _ in range(to_serve):
-        cust = game.venue.line.popleft()
-        drink = cust.desiredDrink
+        drink = game.venue.line.pop_drink()
 
         # Check inventory
-        canMake = True
-        for ing, qty in drink.recipe.items():
-            if game.stock.get(ing, 0) < qty:
-                canMake = False
-                break
-
-        if not canMake:
+        if not can_make(drink, game.stock):
             lostStock += 1
             continue
 
         # Deduct ingredients
-        for ing, qty in drink.recipe.items():
-            game.stock[ing] -= qty
+        deduct_ingredients(drink, game.stock)
 
         # Register sale
         game.cash += drink.basePrice
@@ -42,16 +32,22 @@ def process_turn(game):
         drinks_served_list.append(drink)   # NEW
 
     # 2. PATIENCE DECAY
-    new_line = deque()
-
-    for cust in game.venue.line:
-        cust.patience -= 1
-        if cust.patience > 0:
-            new_line.append(cust)
-        else:
-            lostPatience += 1
-
-    game.venue.line = new_line
+    lostPatience = game.venue.line.decay()
 
     # NEW — return drinks_served_list
     return served, lostStock, lostPatience, drinks_served_list
+
+
+TURN_ENGINES = ("python", "numpy")
+
+def get_turn_engine(name):
+    """
+    Look up a turn engine by name.
+    The NumPy engine is imported on demand so the default path stays dependency-free.
+    """
+    if name == "python":
+        return process_turn
+    if name == "numpy":
+        from .turn_engine_np import process_turn_np
+        return process_turn_np
+    raise ValueError(f"Unknown turn engine {name!r}, expected one of {TURN_ENGINES}")
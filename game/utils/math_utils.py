@@ -1,10 +1,73 @@
 import random, math
+from functools import lru_cache
+
+# Above this mean, Knuth's method (O(lam) draws, exp(-lam) underflow) is
+# replaced by transformed rejection, which needs ~1.1 draw pairs on average.
+PTRS_THRESHOLD = 10.0
+
+
+def poisson(lam: float, rng=random) -> int:
+    if lam <= 0:
+        return 0
+    if lam >= PTRS_THRESHOLD:
+        return _poisson_ptrs(lam, rng)
 
-def poisson(lam: float) -> int:
     L = math.exp(-lam)
     k = 0
     p = 1.0
     while p > L:
         k += 1
-        p *= random.random()
-    return k - 1
\ No newline at end of file
+        p *= rng.random()
+    return k - 1
+
+
+def poisson_many(lams, rng=random) -> list:
+    """
+    Draw one Poisson sample per mean in `lams` (a sequence or NumPy array).
+
+    A RandomStream draws the whole batch in one vectorized NumPy call;
+    any other rng (e.g. the random module) falls back to scalar draws.
+    """
+    generator = getattr(rng, "generator", None)
+    if generator is not None:
+        return generator.poisson(lams).tolist()
+    return [poisson(float(lam), rng) for lam in lams]
+
+
+def percentile(sorted_vals, q):
+    """Linearly interpolated q-quantile (0 <= q <= 1) of an already sorted list."""
+    if not sorted_vals:
+        return 0.0
+    pos = (len(sorted_vals) - 1) * q
+    lo = math.floor(pos)
+    hi = math.ceil(pos)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+@lru_cache(maxsize=256)
+def _ptrs_constants(lam):
+    slam = math.sqrt(lam)
+    b = 0.931 + 2.53 * slam
+    a = -0.059 + 0.02483 * b
+    log_invalpha = math.log(1.1239 + 1.1328 / (b - 3.4))
+    vr = 0.9277 - 3.6224 / (b - 2)
+    return math.log(lam), a, b, log_invalpha, vr
+
+
+def _poisson_ptrs(lam, rng):
+    """Hörmann's PTRS transformed-rejection sampler (valid for lam >= 10)."""
+    loglam, a, b, log_invalpha, vr = _ptrs_constants(lam)
+
+    while True:
+        u = rng.random() - 0.5
+        v = rng.random()
+        us = 0.5 - abs(u)
+        k = math.floor((2 * a / us + b) * u + lam + 0.43)
+
+        if us >= 0.07 and v <= vr:
+            return k
+        if k < 0 or (us < 0.013 and v > us):
+            continue
+        if (math.log(v) + log_invalpha - math.log(a / (us * us) + b)
+                <= -lam + k * loglam - math.lgamma(k + 1)):
+            return k
@@ -0,0 +1,30 @@
+class TrackedList(list):
+    """
+    A list that counts its own mutations.
+    Caches built from the list compare `version` to know when to rebuild.
+    """
+    # Class default so unpickling, which appends items before restoring
+    # instance state, can bump it
+    version = 0
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+
+def _tracked(name):
+    method = getattr(list, name)
+
+    def wrapper(self, *args):
+        self.version += 1
+        return method(self, *args)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(TrackedList, _name, _tracked(_name))
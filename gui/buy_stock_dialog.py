@@ -4,12 +4,25 @@ from PyQt6.QtWidgets import (
     QTableWidget, QTableWidgetItem, QHeaderView,
     QTreeWidget, QTreeWidgetItem
 )
-from PyQt6.QtCore import pyqtSignal, Qt
+from PyQt6.QtCore import pyqtSignal, Qt, QThread
 
-from game.systems.inventory import generate_offers
+from game.systems.purchasing import plan_purchases
 from game.utils.constants import INGREDIENTS_BY_CATEGORY
 
 
+class ForecastThread(QThread):
+    """Runs the (cached) demand forecast off the GUI thread."""
+    forecast_ready = pyqtSignal(object)
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def run(self):
+        from game.forecast import forecast_demand   # heavy: only when planning
+        self.forecast_ready.emit(forecast_demand(self.game))
+
+
 class BuyStockDialog(QDialog):
     stock_changed = pyqtSignal(list)
 
@@ -115,15 +128,21 @@ class BuyStockDialog(QDialog):
         )
         layout.addWidget(self.cart_table)
 
+        self.autofill_btn = QPushButton("Auto-fill Cart")
+        self.autofill_btn.setToolTip("Cheapest cart covering today's expected demand within your cash")
+        self.autofill_btn.clicked.connect(self.auto_fill_cart)
+        layout.addWidget(self.autofill_btn)
+        self.forecast_thread = None
+
         # -----------------------------------------------------
         # Checkout Button
         # -----------------------------------------------------
-        checkout_btn = QPushButton("Checkout & Close")
-        checkout_btn.clicked.connect(self.checkout)
-        layout.addWidget(checkout_btn)
+        self.checkout_btn = QPushButton("Checkout & Close")
+        self.checkout_btn.clicked.connect(self.checkout)
+        layout.addWidget(self.checkout_btn)
 
-        # Load offers
-        self.offers = generate_offers(self.ingredients)
+        # Today's offers (stable for the whole day)
+        self.offers = self.game.offers()
 
         # UI events
         self.tree.currentItemChanged.connect(self.update_preview)
@@ -216,6 +235,10 @@ class BuyStockDialog(QDialog):
             cost = bulk_min * bulk_unit * bundles
             vendor = "Bulk"
 
+        self._add_cart_line(ing, qty, cost, vendor)
+        self.update_preview()
+
+    def _add_cart_line(self, ing, qty, cost, vendor):
         self.cart.append((ing, qty, cost, vendor))
 
         row = self.cart_table.rowCount()
@@ -225,7 +248,49 @@ class BuyStockDialog(QDialog):
         self.cart_table.setItem(row, 2, QTableWidgetItem(vendor))
         self.cart_table.setItem(row, 3, QTableWidgetItem(f"${cost:.2f}"))
 
-        self.update_preview()
+    # -----------------------------------------------------------------
+    # Auto-fill (replaces the cart with the planner's cart)
+    # -----------------------------------------------------------------
+    def auto_fill_cart(self):
+        # The forecast simulates a batch of days; keep the dialog responsive
+        # (and the stock unchanged) while it runs
+        self.autofill_btn.setEnabled(False)
+        self.checkout_btn.setEnabled(False)
+        self.info.setText("Forecasting today's demand…")
+
+        self.forecast_thread = ForecastThread(self.game)
+        self.forecast_thread.forecast_ready.connect(self.on_forecast_ready)
+        self.forecast_thread.start()
+
+    def on_forecast_ready(self, forecast):
+        self.autofill_btn.setEnabled(True)
+        self.checkout_btn.setEnabled(True)
+        plan = plan_purchases(self.game, self.offers, demand=forecast.demand(self.game.menu))
+
+        self.cart = []
+        self.cart_table.setRowCount(0)
+        for ing, qty, cost, vendor in plan.cart():
+            self._add_cart_line(ing, qty, cost, vendor)
+
+        if not plan.lines and plan.coverage >= 1:
+            self.info.setText("Stock already covers today's expected demand.")
+        elif not plan.lines:
+            self.info.setText("Not enough cash to make another cup of any drink.")
+        else:
+            self.info.setText(
+                f"<b>Auto-filled cart</b><br><br>"
+                f"Total Cost: <b>${plan.total:.2f}</b><br>"
+                f"Covers {plan.coverage:.0%} of today's expected demand"
+            )
+        self.cash_preview.setText(
+            f"Cash Available: ${self.game.cash:.2f} → After Purchase: ${self.game.cash - plan.total:.2f}"
+        )
+
+    def done(self, result):
+        # Closing mid-forecast must not destroy a running thread
+        if self.forecast_thread is not None:
+            self.forecast_thread.wait()
+        super().done(result)
 
     # -----------------------------------------------------------------
     # Checkout
@@ -251,9 +316,7 @@ class BuyStockDialog(QDialog):
         summary = []
 
         for ing, qty, cost, vendor in self.cart:
-            self.game.cash -= cost
-            self.game.stock[ing] += qty
-            self.game.dailyIngredientCost += cost
+            self.game.buy_stock(ing, qty, cost)
             summary.append(
                 f"Bought {qty} × {ing.name} from {vendor} (${cost:.2f})"
             )
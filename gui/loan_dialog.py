@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from game.models.loan import Loan
 from game.utils.constants import LOAN_OPTIONS
 
 
@@ -109,7 +110,8 @@ class LoanDialog(QDialog):
             <b>Loan Amount:</b> ${opt.amount:,.0f}<br>
             <b>Interest:</b> {opt.interest_rate * 100:.2f}% per turn<br>
             <b>Payback Rate:</b> {opt.payback_rate * 100:.2f}% of principal<br>
-            <b>Principal Payment:</b> ${payment:,.2f} per turn
+            <b>Principal Payment:</b> ${payment:,.2f} per turn<br>
+            {self._projection_text(opt)}
             </span>
             """
         )
@@ -152,6 +154,32 @@ class LoanDialog(QDialog):
 
         return box
 
+    # --------------------------------------------------
+    # PROJECTIONS
+    # --------------------------------------------------
+    def _projection_text(self, opt):
+        """Payoff day and total cost, read from the precomputed schedule."""
+        loan = next((l for l in self.game.loans if l.name == opt.name), None)
+        proj = (loan or Loan(opt)).projection()
+
+        if proj["days"] is None:
+            return "<b>Payoff:</b> not paid off at this rate"
+
+        # One payment at the end of each day, starting today
+        payoff_day = self.game.day + proj["days"] - 1
+        if loan is not None:
+            return (
+                f"<b>Remaining:</b> ${loan.remaining_balance:,.2f} · "
+                f"paid off on day {payoff_day} ({proj['days']} days)<br>"
+                f"<b>Left to Repay:</b> ${proj['total_paid']:,.2f} "
+                f"(interest ${proj['interest']:,.2f})"
+            )
+        return (
+            f"<b>Payoff:</b> day {payoff_day} ({proj['days']} days)<br>"
+            f"<b>Total Repaid:</b> ${proj['total_paid']:,.2f} "
+            f"(interest ${proj['interest']:,.2f})"
+        )
+
     # --------------------------------------------------
     # TAKE LOAN
     # --------------------------------------------------
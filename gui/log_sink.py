@@ -0,0 +1,92 @@
+# gui/log_sink.py
+
+from __future__ import annotations
+
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from game.config import UI_FPS, LOG_MAX_LINES
+
+
+class LogSink(QObject):
+    """
+    Bounded, batched writer for a QPlainTextEdit log.
+
+    Lines are buffered and appended to the view at most `fps` times per
+    second in one call. The view keeps at most `max_lines` blocks (older ones
+    are dropped by Qt), and `recent` holds the same window as plain strings.
+    The full, unbounded log can be streamed to a file with export_to().
+    """
+    def __init__(self, view: QPlainTextEdit, max_lines: int = LOG_MAX_LINES,
+                 fps: int = UI_FPS, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.view.setMaximumBlockCount(max_lines)
+        self.recent: deque[str] = deque(maxlen=max_lines)
+        self._pending: list[str] = []
+        self._stream = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / fps)))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    @property
+    def max_lines(self) -> int:
+        return self.recent.maxlen
+
+    def set_max_lines(self, max_lines: int):
+        self.view.setMaximumBlockCount(max_lines)
+        self.recent = deque(self.recent, maxlen=max_lines)
+
+    # -------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------
+    def write(self, line: str):
+        self.write_lines((line,))
+
+    def write_lines(self, lines):
+        lines = list(lines)
+        self._pending.extend(lines)
+        self.recent.extend(lines)
+        if self._stream is not None:
+            self._stream.write("\n".join(lines) + "\n")
+
+    def flush(self):
+        """Append everything written since the last flush in one go."""
+        if not self._pending:
+            return
+        # Only the last max_lines could survive in the view anyway
+        lines = self._pending[-self.max_lines:]
+        self._pending = []
+        self.view.appendPlainText("\n".join(lines))
+
+    def clear(self):
+        """Clear the view and recent lines (an export stream keeps going)."""
+        self._pending = []
+        self.recent.clear()
+        self.view.clear()
+
+    # -------------------------------------------------------
+    # Export
+    # -------------------------------------------------------
+    def export_to(self, path: str):
+        """
+        Stream the log to `path` from now on, starting with the lines still
+        held in memory. Replaces any previous export.
+        """
+        self.close_export()
+        self._stream = open(path, "w", encoding="utf-8")
+        if self.recent:
+            self._stream.write("\n".join(self.recent) + "\n")
+
+    def close_export(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    @property
+    def exporting(self) -> bool:
+        return self._stream is not None
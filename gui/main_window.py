@@ -2,11 +2,6 @@
 
 from __future__ import annotations
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-
-import numpy as np
 from collections import defaultdict
 
 from PyQt6.QtWidgets import (
@@ -19,115 +14,48 @@ from PyQt6.QtWidgets import (
     QPlainTextEdit,
     QSplitter,
     QScrollArea,
+    QFileDialog,
+    QMessageBox,
+    QCheckBox,
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
+
+import os
 
-from game.config import TURNS_PER_DAY
-from game.game import Game
+from game.config import TURNS_PER_DAY, AUTOSAVE_PATH, TURN_DELAY_MS, CHART_PRELOAD_DELAY_MS
+from game.game import Game, DIRTY_SECTIONS, hours_of_day
+from game.persistence import save_game, load_game, peek_save, SaveFormatError
 from gui.action_dialog import Action
+from gui.log_sink import LogSink
+from gui.stock_table import StockPanel
+from gui.tick_aggregator import TickAggregator
 
 
 class GameThread(QThread):
-    tick = pyqtSignal(dict)
     finished = pyqtSignal(dict)
 
-    def __init__(self, game: Game, turns: int):
+    def __init__(self, game: Game, turns: int, sink: TickAggregator, turn_delay_ms: int = 0):
         super().__init__()
         self.game = game
         self.turns = turns
+        self.sink = sink
+        self.turn_delay_ms = turn_delay_ms
 
     def run(self):
-        stats = {
-            "served": 0,
-            "lost_queue": 0,
-            "lost_stock": 0,
-            "lost_patience": 0,
-        }
-
-        hour_sales: dict[str, dict[str, int]] = {}
-
-        # Revenue = sum of prices of sold drinks (NOT cash delta)
-        revenue = 0.0
-
-        for t in range(self.turns):
-            prev_stock = dict(self.game.stock)
-
-            served, lostQ, lostS, lostP, drinks_list = self.game.single_turn()
-
-            stats["served"] += served
-            stats["lost_queue"] += lostQ
-            stats["lost_stock"] += lostS
-            stats["lost_patience"] += lostP
-
-            revenue += sum(d.basePrice for d in drinks_list)
-
-            clock = self.clock_from_turn(t)
-            hour_label = clock.split(":")[0] + ":00"
-            hour_sales.setdefault(hour_label, {})
-
-            for drink in drinks_list:
-                hour_sales[hour_label][drink.name] = hour_sales[hour_label].get(drink.name, 0) + 1
-
-            stock_changes = {}
-            for ing, old_qty in prev_stock.items():
-                new_qty = self.game.stock.get(ing, 0)
-                delta = new_qty - old_qty
-                if delta != 0:
-                    stock_changes[ing] = delta
-
-            self.tick.emit({
-                "turn": t,
-                "clock": clock,
-                "served": served,
-                "lost_queue": lostQ,
-                "lost_stock": lostS,
-                "lost_patience": lostP,
-                "queue_size": len(self.game.venue.line),
-                "cash": self.game.cash,
-                "stock_changes": stock_changes,
-            })
-        
-        self.game.process_loans_per_day()
-
-        # End-of-day accounting
-        wages = sum(e.wage for e in self.game.employees)
-        rent = float(self.game.venue.rent)
-
-        # Loan payments made TODAY only
-        loans_today = float(self.game.dailyLoanPayments)
-        print(loans_today)
-        total_expenses = (
-            float(self.game.dailyIngredientCost)
-            + float(self.game.dailyAdSpend)
-            + float(wages)
-            + float(rent)
-            + loans_today
-        )
+        summary = self.game.run_day(self.turns, on_tick=self.on_tick)
+        self.finished.emit(summary)
 
-        profit = revenue - total_expenses
-        self.game.cash -= (wages + rent)
-
-        summary = {
-            "served": stats["served"],
-            "lost_queue": stats["lost_queue"],
-            "lost_stock": stats["lost_stock"],
-            "lost_patience": stats["lost_patience"],
-            "revenue": revenue,
-            "expenses": total_expenses,
-            "loan_payments": loans_today,
-            "profit": profit,
-            "cash_end": self.game.cash,
-            "hour_sales": hour_sales,
-        }
+    def on_tick(self, info: dict):
+        # Hand the tick off without touching Qt; the aggregator delivers it
+        self.sink.push(info)
+        if self.turn_delay_ms:
+            self.msleep(self.turn_delay_ms * info["turns"])
 
-        self.finished.emit(summary)
 
-    @staticmethod
-    def clock_from_turn(turn_idx: int) -> str:
-        minutes = turn_idx * 15
-        hour = 8 + minutes // 60
-        minute = minutes % 60
-        return f"{hour:02d}:{minute:02d}"
+class ChartLoader(QThread):
+    """Imports the charting stack (matplotlib, NumPy) off the GUI thread."""
+    def run(self):
+        import gui.sales_chart  # noqa: F401
 
 
 class MainWindow(QWidget):
@@ -137,6 +65,8 @@ class MainWindow(QWidget):
         self.resize(1400, 900)
 
         self.game = Game()
+        self.thread = None
+        self._autosave_warned = False
 
         splitter = QSplitter(Qt.Orientation.Horizontal, self)
         main_layout = QHBoxLayout(self)
@@ -167,9 +97,9 @@ class MainWindow(QWidget):
         self.menu_label.setTextFormat(Qt.TextFormat.RichText)
         left_layout.addWidget(self.menu_label)
 
-        self.stock_label = QLabel()
-        self.stock_label.setTextFormat(Qt.TextFormat.RichText)
-        left_layout.addWidget(self.stock_label)
+        left_layout.addWidget(QLabel("<b>Stock:</b>"))
+        self.stock_panel = StockPanel(self.game)
+        left_layout.addWidget(self.stock_panel)
 
         # Loan section
         self.loan_label = QLabel()
@@ -183,6 +113,20 @@ class MainWindow(QWidget):
         btn_row.addWidget(self.run_btn)
         left_layout.addLayout(btn_row)
 
+        self.max_speed_box = QCheckBox("Max speed")
+        self.max_speed_box.setChecked(True)
+        left_layout.addWidget(self.max_speed_box)
+
+        save_row = QHBoxLayout()
+        self.save_btn = QPushButton("Save")
+        self.load_btn = QPushButton("Load")
+        save_row.addWidget(self.save_btn)
+        save_row.addWidget(self.load_btn)
+        self.export_log_btn = QPushButton("Export Log…")
+        self.export_log_btn.setCheckable(True)
+        save_row.addWidget(self.export_log_btn)
+        left_layout.addLayout(save_row)
+
         self.bar = QProgressBar()
         self.bar.setMaximum(TURNS_PER_DAY)
         left_layout.addWidget(self.bar)
@@ -194,6 +138,7 @@ class MainWindow(QWidget):
             "background-color: #111; color: #eee; font-family: monospace;"
         )
         left_layout.addWidget(self.log_edit)
+        self.log = LogSink(self.log_edit, parent=self)
 
         self.summary_label = QLabel("Day summary will appear here.")
         self.summary_label.setTextFormat(Qt.TextFormat.RichText)
@@ -210,51 +155,187 @@ class MainWindow(QWidget):
         right_scroll.setWidget(right_container)
         right_layout = QVBoxLayout(right_container)
 
-        self.sales_chart = FigureCanvasQTAgg(Figure(figsize=(6, 4)))
-        self.ax = self.sales_chart.figure.subplots()
-        right_layout.addWidget(self.sales_chart)
+        # The chart (matplotlib) is created after the window first paints
+        self.sales_chart = None
+        self.chart_loader = None
+        self.chart_placeholder = QLabel("Hourly sales will appear here.")
+        self.chart_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.chart_placeholder.setMinimumHeight(400)
+        right_layout.addWidget(self.chart_placeholder)
+        self._chart_layout = right_layout
+
+        self.live_chart_box = QCheckBox("Update chart during the day")
+        right_layout.addWidget(self.live_chart_box)
 
         right_layout.addStretch()
 
+        self.ticks = TickAggregator(parent=self)
+        self.ticks.flushed.connect(self.on_tick)
+
         self.action_btn.clicked.connect(self.open_action)
         self.run_btn.clicked.connect(self.run_day)
-
-        self.update_info()
+        self.save_btn.clicked.connect(self.save)
+        self.load_btn.clicked.connect(self.load)
+        self.export_log_btn.toggled.connect(self.toggle_log_export)
+
+        self.update_info(full=True)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.sales_chart is None and self.chart_loader is None:
+            # Import the charting stack in the background once the window is
+            # up; only the canvas itself is built on the GUI thread
+            QTimer.singleShot(CHART_PRELOAD_DELAY_MS, self.preload_sales_chart)
+
+    def preload_sales_chart(self):
+        if self.chart_loader is None:
+            self.chart_loader = ChartLoader()
+            self.chart_loader.finished.connect(self.ensure_sales_chart)
+            self.chart_loader.start()
+
+    def ensure_sales_chart(self):
+        """Create the sales chart on first use (imports matplotlib)."""
+        if self.sales_chart is None:
+            from gui.sales_chart import HourlySalesChart
+
+            self.sales_chart = HourlySalesChart(figsize=(6, 4))
+            index = self._chart_layout.indexOf(self.chart_placeholder)
+            self._chart_layout.insertWidget(index, self.sales_chart.canvas)
+            self.chart_placeholder.hide()
+        return self.sales_chart
 
     def open_action(self):
         dialog = Action(self.game)
         dialog.exec()
         self.update_info()
 
-    def run_day(self):
-        self.game.opening_cash = self.game.cash
-        self.game.dailyLoanPayments = 0.0
+    def save(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Game", "", "Boba saves (*.boba)")
+        if not path:
+            return
+        try:
+            save_game(self.game, path)
+        except (OSError, SaveFormatError) as e:
+            QMessageBox.warning(self, "Save Failed", str(e))
+
+    def load(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Load Game", "", "Boba saves (*.boba)")
+        if not path:
+            return
+        try:
+            game = load_game(path)
+        except (OSError, SaveFormatError) as e:
+            QMessageBox.warning(self, "Load Failed", str(e))
+            return
+        self.set_game(game)
 
+    def set_game(self, game):
+        self.game = game
+        self.stock_panel.set_game(game)
+        self.update_info(full=True)
+
+    def offer_resume(self):
+        """Ask whether to continue from the autosave left by the last session."""
+        try:
+            info = peek_save(AUTOSAVE_PATH)
+        except FileNotFoundError:
+            return
+        except (OSError, SaveFormatError) as e:
+            QMessageBox.warning(self, "Autosave Unreadable", str(e))
+            return
+        answer = QMessageBox.question(
+            self, "Resume Game",
+            f"Resume your last game? (Day {info['day']}, {info['venue']}, ${info['cash']:.2f})",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            game = load_game(AUTOSAVE_PATH)
+        except (OSError, SaveFormatError) as e:
+            QMessageBox.warning(self, "Load Failed", str(e))
+            return
+        self.set_game(game)
+
+    def toggle_log_export(self, on: bool):
+        if not on:
+            self.log.close_export()
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Log", "", "Text files (*.txt *.log)")
+        if not path:
+            self.export_log_btn.setChecked(False)
+            return
+        try:
+            self.log.export_to(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", str(e))
+            self.export_log_btn.setChecked(False)
+
+    def closeEvent(self, event):
+        # Mid-day state is not saved; the last end-of-day autosave stands
+        if self.thread is None or not self.thread.isRunning():
+            self.autosave()
+        self.log.close_export()
+        if self.chart_loader is not None:
+            self.chart_loader.wait()
+        super().closeEvent(event)
+
+    def autosave(self):
+        try:
+            os.makedirs(os.path.dirname(AUTOSAVE_PATH), exist_ok=True)
+            save_game(self.game, AUTOSAVE_PATH)
+        except (OSError, SaveFormatError) as e:
+            # Keep playing; warn once, then only note it in the log
+            self.log.write(f"Autosave failed: {e}")
+            self.log.flush()
+            if not self._autosave_warned:
+                self._autosave_warned = True
+                QMessageBox.warning(self, "Autosave Failed", str(e))
+
+    def run_day(self):
         self.bar.setValue(0)
-        self.log_edit.clear()
+        self.log.clear()
 
         self.run_btn.setEnabled(False)
         self.action_btn.setEnabled(False)
+        self.load_btn.setEnabled(False)
+
+        if self.live_chart_box.isChecked():
+            self.ensure_sales_chart().reset(hours_of_day(TURNS_PER_DAY), self._menu_names())
 
-        self.thread = GameThread(self.game, turns=TURNS_PER_DAY)
-        self.thread.tick.connect(self.on_tick)
+        delay = 0 if self.max_speed_box.isChecked() else TURN_DELAY_MS
+        self.thread = GameThread(self.game, TURNS_PER_DAY, self.ticks, delay)
         self.thread.finished.connect(self.on_day_finished)
         self.thread.finished.connect(self._reenable_controls)
+        self.ticks.start()
         self.thread.start()
 
     def _reenable_controls(self, *_args):
         self.run_btn.setEnabled(self.game.cash >= 0)
         self.action_btn.setEnabled(True)
+        self.load_btn.setEnabled(True)
 
     def on_tick(self, info: dict):
-        self.bar.setValue(info["turn"] + 1)
+        """Handle one frame's worth of merged ticks from the aggregator."""
+        self.bar.setValue(info["turn"] + info["turns"])
+
+        self.log.write_lines(self._tick_line(t) for t in info["ticks"])
+
+        if self.live_chart_box.isChecked() and info["hour_sales"]:
+            self.ensure_sales_chart().add_sales(info["hour_sales"])
 
+        self.update_info()
+
+    def _menu_names(self) -> list[str]:
+        return [drink.name for drink in self.game.menu]
+
+    @staticmethod
+    def _tick_line(info: dict) -> str:
         stock_parts = []
         for ing, delta in info["stock_changes"].items():
             stock_parts.append(f"{ing.name} {delta:+}")
         stock_str = ", ".join(stock_parts) if stock_parts else "—"
 
-        self.log_edit.appendPlainText(
+        return (
             f"[{info['clock']}] "
             f"Q={info['queue_size']} "
             f"Served={info['served']} "
@@ -265,9 +346,11 @@ class MainWindow(QWidget):
             f"Stock: {stock_str}"
         )
 
-        self.update_info()
-
     def on_day_finished(self, summary: dict):
+        # Deliver any ticks still buffered before showing the summary
+        self.ticks.stop()
+        self.log.flush()
+
         wages = sum(e.wage for e in self.game.employees)
         rent = float(self.game.venue.rent)
         ingredients = float(self.game.dailyIngredientCost)
@@ -287,11 +370,18 @@ class MainWindow(QWidget):
                 revenue_lines += f" - {name}: {drink_totals[name]}<br>"
             revenue_lines += "<br>"
 
+        spoilage_lines = ""
+        if summary["spoiled"]:
+            spoilage_lines += "<b>Spoiled Overnight:</b><br>"
+            for ing, units in sorted(summary["spoiled"].items(), key=lambda s: s[0].name):
+                spoilage_lines += f" - {ing.name}: {units}<br>"
+            spoilage_lines += f"<b>Spoilage Cost:</b> ${summary['spoilage_cost']:.2f}<br><br>"
+
         total_expenses = float(summary["expenses"])
 
         text = (
             f"<b>Day Summary</b><br>"
-            f"<b>Opening Cash:</b> ${self.game.opening_cash:.2f}<br>"
+            f"<b>Opening Cash:</b> ${summary['cash_start']:.2f}<br>"
             f"--------------------------<br>"
             f"<b>Served:</b> {summary['served']}<br>"
             f"<b>Lost (queue):</b> {summary['lost_queue']}<br>"
@@ -307,160 +397,68 @@ class MainWindow(QWidget):
             f" - Loans:       ${loans:.2f}<br>"
             f"<b>Total Expenses:</b> ${total_expenses:.2f}<br><br>"
             f"<b>Profit:</b> ${summary['profit']:.2f}<br>"
-            f"<b>Cash End:</b> ${summary['cash_end']:.2f}<br>"
+            f"<b>Cash End:</b> ${summary['cash_end']:.2f}<br><br>"
+            f"{spoilage_lines}"
         )
 
         self.summary_label.setText(text)
 
-        self.render_hourly_sales_chart(summary["hour_sales"])
-        self.update_info()
+        self.ensure_sales_chart().set_sales(summary["hour_sales"], self._menu_names())
+        # The day thread's last changes may have raced take_dirty(); redraw all
+        self.update_info(full=True)
 
         # Reset daily counters
-        self.game.dailyIngredientCost = 0
-        self.game.dailyAdSpend = 0
-        if hasattr(self.game, "dailyLoanPayments"):
-            self.game.dailyLoanPayments = 0.0
-
-    def update_info(self):
-        self.cash_label.setText(f"<b>Cash:</b> ${self.game.cash:.2f}")
-
-        # Disable Run Day if cash < 0
-        self.run_btn.setEnabled(self.game.cash >= 0)
-
-        v = self.game.venue
-        self.venue_label.setText(
-            f"<b>Venue:</b> {v.name} "
-            f"(Max line: {v.maxLine}, Foot traffic: {v.footTraffic}, Rent: ${v.rent})"
-        )
-
-        e_lines = ["<b>Employees:</b>"]
-        for emp in self.game.employees:
-            e_lines.append(
-                f" - {emp.name}: Cap {emp.capacity}, Charm {emp.charm}, Wage ${emp.wage}"
-            )
-        self.employee_label.setText("<br>".join(e_lines))
-
-        m_lines = ["<b>Menu:</b>"]
-        for drink in self.game.menu:
-            m_lines.append(f" - {drink.name} (${drink.basePrice:.2f})")
-        self.menu_label.setText("<br>".join(m_lines))
-
-        LOW_STOCK_THRESHOLD = 10
-        s_lines = ["<b>Stock:</b>"]
-
-        by_category = defaultdict(list)
-        for ing in self.game.ingredients:
-            by_category[ing.category].append(ing)
-
-        for category, items in by_category.items():
-            s_lines.append(f"<br><b>── {category} ──</b>")
-            for ing in items:
-                qty = self.game.stock.get(ing, 0)
-                if qty <= LOW_STOCK_THRESHOLD:
-                    qty_text = f"<span style='color:red; font-weight:bold;'>{qty}</span>"
-                else:
-                    qty_text = str(qty)
-                s_lines.append(f"&nbsp;&nbsp;{ing.name}: {qty_text}")
-
-        self.stock_label.setText("<br>".join(s_lines))
-
-        # Loan display
-        loan_lines = ["<b>Loans:</b>"]
-        if hasattr(self.game, "loans") and self.game.loans:
-            for loan in self.game.loans:
-                loan_lines.append(
-                    f"&nbsp;&nbsp;{loan.name}: "
-                    f"<b>${loan.remaining_balance:.2f}</b> "
-                    f"(Pay ${loan.payment_per_turn:.2f}/turn)"
-                )
-        else:
-            loan_lines.append("&nbsp;&nbsp;None")
-
-        self.loan_label.setText("<br>".join(loan_lines))
-
-    def render_hourly_sales_chart(self, hour_sales):
-        self.ax.clear()
-
-        if not hour_sales:
-            self.ax.set_title("No Sales Data")
-            self.sales_chart.draw()
-            return
-
-        hours = sorted(hour_sales.keys())
-        drink_names = sorted({
-            drink
-            for hour in hour_sales.values()
-            for drink in hour.keys()
-        })
-
-        if not drink_names:
-            self.ax.set_title("No Drinks Sold Today")
-            self.sales_chart.draw()
-            return
-
-        x = np.arange(len(hours))
-        width = 0.8 / max(1, len(drink_names))
-
-        cmap = plt.get_cmap("tab10")
-        colors = {drink: cmap(i) for i, drink in enumerate(drink_names)}
-
-        max_height = 0
-
-        for i, drink in enumerate(drink_names):
-            yvals = [hour_sales[h].get(drink, 0) for h in hours]
-            max_height = max(max_height, max(yvals))
-
-            rects = self.ax.bar(
-                x + i * width,
-                yvals,
-                width,
-                label=drink,
-                color=colors[drink],
-                zorder=3,
-            )
-
-            self.ax.bar_label(
-                rects,
-                labels=[str(v) if v > 0 else "" for v in yvals],
-                padding=2,
-                fontsize=9,
-                color="white",
+        self.game.start_new_day()
+        self.autosave()
+
+    def update_info(self, full=False):
+        """Re-render the info panels whose game state changed since the last call."""
+        dirty, changed = self.game.take_dirty()
+        if full:
+            dirty = set(DIRTY_SECTIONS)
+            changed = set(self.game.stock)
+
+        if "cash" in dirty:
+            self.cash_label.setText(f"<b>Cash:</b> ${self.game.cash:.2f}")
+
+            # Disable Run Day if cash < 0
+            self.run_btn.setEnabled(self.game.cash >= 0)
+
+        if "venue" in dirty:
+            v = self.game.venue
+            self.venue_label.setText(
+                f"<b>Venue:</b> {v.name} "
+                f"(Max line: {v.maxLine}, Foot traffic: {v.footTraffic}, Rent: ${v.rent})"
             )
 
-        total_sales = [sum(hour_sales[h].values()) for h in hours]
-        max_height = max(max_height, max(total_sales))
-        center_x = x + width * (len(drink_names) - 1) / 2
-
-        self.ax.plot(
-            center_x,
-            total_sales,
-            color="black",
-            marker="o",
-            linewidth=2,
-            label="Total Sales",
-            zorder=5,
-        )
-
-        for xi, total in zip(center_x, total_sales):
-            if total > 0:
-                self.ax.text(
-                    xi,
-                    total + 0.2,
-                    str(total),
-                    ha="center",
-                    va="bottom",
-                    fontsize=9,
-                    fontweight="bold",
-                    color="black",
-                    zorder=6,
+        if "staff" in dirty:
+            e_lines = ["<b>Employees:</b>"]
+            for emp in self.game.employees:
+                e_lines.append(
+                    f" - {emp.name}: Cap {emp.capacity}, Charm {emp.charm}, Wage ${emp.wage}"
                 )
-
-        self.ax.set_ylim(0, max_height * 1.25 + 1)
-        self.ax.grid(axis="y", linestyle="--", alpha=0.3, zorder=0)
-        self.ax.set_xticks(x)
-        self.ax.set_xticklabels(hours)
-        self.ax.set_xlabel("Hour of Day")
-        self.ax.set_ylabel("Drinks Sold")
-        self.ax.set_title("Hourly Drink Sales")
-        self.ax.legend(title="Drink Types")
-        self.sales_chart.draw()
\ No newline at end of file
+            self.employee_label.setText("<br>".join(e_lines))
+
+        if "menu" in dirty:
+            m_lines = ["<b>Menu:</b>"]
+            for drink in self.game.menu:
+                cups = self.game.stock.max_producible(drink)
+                m_lines.append(f" - {drink.name} (${drink.basePrice:.2f}) · {cups} cups left")
+            self.menu_label.setText("<br>".join(m_lines))
+
+        if changed:
+            self.stock_panel.refresh(changed)
+
+        if "loans" in dirty:
+            loan_lines = ["<b>Loans:</b>"]
+            if self.game.loans:
+                for loan in self.game.loans:
+                    loan_lines.append(
+                        f"&nbsp;&nbsp;{loan.name}: "
+                        f"<b>${loan.remaining_balance:.2f}</b> "
+                        f"(Pay ${loan.payment_per_turn:.2f}/turn)"
+                    )
+            else:
+                loan_lines.append("&nbsp;&nbsp;None")
+
+            self.loan_label.setText("<br>".join(loan_lines))
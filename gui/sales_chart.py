@@ -0,0 +1,235 @@
+# gui/sales_chart.py
+
+from __future__ import annotations
+
+import matplotlib
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+import numpy as np
+
+
+class HourlySalesChart:
+    """
+    Grouped bar chart of drinks sold per hour, plus a total-sales line.
+
+    Artists are created once per (hours, drinks) layout; new data only moves
+    bar heights, labels and the total line. When the y-axis does not have to
+    grow, updates are blitted over a cached background instead of redrawing
+    the whole figure, which keeps live (per-frame) updates cheap.
+    """
+    def __init__(self, figsize=(6, 4)):
+        self.canvas = FigureCanvasQTAgg(Figure(figsize=figsize))
+        self.figure = self.canvas.figure
+        self.ax = self.figure.subplots()
+
+        self.hours: list[str] = []
+        self.drinks: list[str] = []
+        self.counts = np.zeros((0, 0), dtype=int)   # drinks x hours
+
+        self._bars = []          # per drink: list of Rectangles
+        self._bar_labels = []    # per drink: list of Annotations
+        self._total_line = None
+        self._total_labels = []
+        self._ylim = 0.0
+        self._background = None
+
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self._build()
+
+    # -------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------
+    def reset(self, hours, drinks):
+        """Start an empty day, keeping the artists if the layout is unchanged."""
+        self._ensure_layout(list(hours), sorted(drinks))
+        self.counts[:] = 0
+        self._update(grow_only=False)
+
+    def add_sales(self, hour_sales):
+        """Add {hour: {drink: count}} to the current counts (live updates)."""
+        extra = {d for sales in hour_sales.values() for d in sales}
+        hours = sorted(set(self.hours) | hour_sales.keys())
+        if hours != self.hours or not extra.issubset(self.drinks):
+            self._ensure_layout(hours, sorted(extra | set(self.drinks)))
+
+        row = {d: i for i, d in enumerate(self.drinks)}
+        col = {h: j for j, h in enumerate(self.hours)}
+        for hour, sales in hour_sales.items():
+            for drink, count in sales.items():
+                self.counts[row[drink], col[hour]] += count
+        self._update(grow_only=True)
+
+    def set_sales(self, hour_sales, drinks=()):
+        """
+        Show a full day of {hour: {drink: count}}. `drinks` adds names that
+        should keep a slot even without sales (e.g. the whole menu), so the
+        layout stays stable from day to day.
+        """
+        hours = sorted(hour_sales.keys())
+        names = {d for sales in hour_sales.values() for d in sales}
+        self._ensure_layout(hours, sorted(names | set(drinks)))
+
+        self.counts[:] = 0
+        for j, hour in enumerate(self.hours):
+            for i, drink in enumerate(self.drinks):
+                self.counts[i, j] = hour_sales.get(hour, {}).get(drink, 0)
+        self._update(grow_only=False)
+
+    # -------------------------------------------------------
+    # Layout (full rebuild)
+    # -------------------------------------------------------
+    def _ensure_layout(self, hours, drinks):
+        if hours == self.hours and drinks == self.drinks:
+            return
+        self.hours = hours
+        self.drinks = drinks
+        self.counts = np.zeros((len(drinks), len(hours)), dtype=int)
+        self._build()
+
+    def _build(self):
+        ax = self.ax
+        ax.clear()
+        self._bars = []
+        self._bar_labels = []
+        self._total_line = None
+        self._total_labels = []
+        self._ylim = 0.0
+
+        if not self.hours:
+            ax.set_title("No Sales Data")
+            self.canvas.draw_idle()
+            return
+        if not self.drinks:
+            ax.set_title("No Drinks Sold Today")
+            self.canvas.draw_idle()
+            return
+
+        x = np.arange(len(self.hours))
+        width = 0.8 / max(1, len(self.drinks))
+        cmap = matplotlib.colormaps["tab10"]
+
+        for i, drink in enumerate(self.drinks):
+            rects = ax.bar(
+                x + i * width,
+                np.zeros(len(x)),
+                width,
+                label=drink,
+                color=cmap(i % cmap.N),
+                zorder=3,
+            )
+            labels = []
+            for rect in rects:
+                rect.set_animated(True)
+                labels.append(ax.annotate(
+                    "",
+                    xy=(rect.get_x() + rect.get_width() / 2, 0),
+                    xytext=(0, 2),
+                    textcoords="offset points",
+                    ha="center",
+                    va="bottom",
+                    fontsize=9,
+                    color="white",
+                    animated=True,
+                ))
+            self._bars.append(list(rects))
+            self._bar_labels.append(labels)
+
+        center_x = x + width * (len(self.drinks) - 1) / 2
+        (self._total_line,) = ax.plot(
+            center_x,
+            np.zeros(len(x)),
+            color="black",
+            marker="o",
+            linewidth=2,
+            label="Total Sales",
+            zorder=5,
+            animated=True,
+        )
+        for xi in center_x:
+            self._total_labels.append(ax.text(
+                xi,
+                0,
+                "",
+                ha="center",
+                va="bottom",
+                fontsize=9,
+                fontweight="bold",
+                color="black",
+                zorder=6,
+                animated=True,
+            ))
+
+        ax.grid(axis="y", linestyle="--", alpha=0.3, zorder=0)
+        ax.set_xticks(x)
+        ax.set_xticklabels(self.hours)
+        ax.set_xlabel("Hour of Day")
+        ax.set_ylabel("Drinks Sold")
+        ax.set_title("Hourly Drink Sales")
+        ax.legend(title="Drink Types")
+        self._set_ylim(1.0)
+
+    # -------------------------------------------------------
+    # Data updates
+    # -------------------------------------------------------
+    def _update(self, grow_only):
+        if not self._bars:
+            return
+
+        totals = self.counts.sum(axis=0)
+        for rects, labels, row in zip(self._bars, self._bar_labels, self.counts):
+            for rect, label, value in zip(rects, labels, row.tolist()):
+                rect.set_height(value)
+                label.xy = (label.xy[0], value)
+                label.set_text(str(value) if value > 0 else "")
+
+        self._total_line.set_ydata(totals)
+        for label, total in zip(self._total_labels, totals.tolist()):
+            label.set_y(total + 0.2)
+            label.set_text(str(total) if total > 0 else "")
+
+        top = max(int(self.counts.max(initial=0)), int(totals.max(initial=0))) * 1.25 + 1
+        if grow_only:
+            # Grow in coarse steps so live updates rarely need a full redraw
+            if top > self._ylim:
+                self._set_ylim(top * 1.5)
+                return
+        elif top != self._ylim:
+            self._set_ylim(top)
+            return
+        self._blit()
+
+    def _set_ylim(self, top):
+        self._ylim = top
+        self.ax.set_ylim(0, top)
+        self._background = None
+        self.canvas.draw_idle()
+
+    # -------------------------------------------------------
+    # Blitting
+    # -------------------------------------------------------
+    def _animated(self):
+        """Data artists that currently show something (empty ones are skipped)."""
+        for rects in self._bars:
+            yield from (r for r in rects if r.get_height())
+        for labels in self._bar_labels:
+            yield from (t for t in labels if t.get_text())
+        if self._total_line is not None:
+            yield self._total_line
+        yield from (t for t in self._total_labels if t.get_text())
+
+    def _on_draw(self, event):
+        # A full draw skips animated artists: cache the static background,
+        # then paint the data on top of it.
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self._animated():
+            self.figure.draw_artist(artist)
+
+    def _blit(self):
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._background)
+        for artist in self._animated():
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
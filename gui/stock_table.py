@@ -0,0 +1,160 @@
+# gui/stock_table.py
+
+from __future__ import annotations
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QBrush, QColor, QFont
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QCheckBox, QTableView, QHeaderView
+
+# Stock at or below this is highlighted (and kept by the low-stock filter)
+LOW_STOCK_THRESHOLD = 10
+
+COLUMNS = ("Category", "Ingredient", "Qty")
+CATEGORY, NAME, QTY = range(len(COLUMNS))
+
+# Role returning raw values (numbers stay numbers) for sorting
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+_LOW_BRUSH = QBrush(QColor("red"))
+_LOW_FONT = QFont()
+_LOW_FONT.setBold(True)
+
+
+class StockTableModel(QAbstractTableModel):
+    """
+    One row per ingredient, grouped by category. Quantities are read from the
+    game's Stock on demand, so refresh() only has to say which rows changed.
+    """
+    def __init__(self, game=None, parent=None):
+        super().__init__(parent)
+        self.game = None
+        self.rows = []
+        self._row_of = {}
+        if game is not None:
+            self.set_game(game)
+
+    def set_game(self, game):
+        self.beginResetModel()
+        self.game = game
+
+        by_category = {}
+        for ing in game.ingredients:
+            by_category.setdefault(ing.category, []).append(ing)
+        self.rows = [ing for items in by_category.values() for ing in items]
+        self._row_of = {ing: row for row, ing in enumerate(self.rows)}
+        self.endResetModel()
+
+    def refresh(self, changed):
+        """Emit dataChanged for the quantity cells of changed ingredients."""
+        rows = sorted(self._row_of[ing] for ing in changed if ing in self._row_of)
+        if not rows:
+            return
+
+        # One signal per run of adjacent rows
+        start = prev = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == prev + 1:
+                prev = row
+                continue
+            self.dataChanged.emit(self.index(start, QTY), self.index(prev, QTY))
+            start = prev = row
+
+    def qty(self, row):
+        return self.game.stock.get(self.rows[row], 0)
+
+    # -------------------------------------------------------
+    # QAbstractTableModel
+    # -------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        ing = self.rows[index.row()]
+        col = index.column()
+
+        if role in (Qt.ItemDataRole.DisplayRole, SORT_ROLE):
+            if col == CATEGORY:
+                return ing.category
+            if col == NAME:
+                return ing.name
+            qty = self.qty(index.row())
+            return qty if role == SORT_ROLE else str(qty)
+
+        if col == QTY:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            if self.qty(index.row()) <= LOW_STOCK_THRESHOLD:
+                if role == Qt.ItemDataRole.ForegroundRole:
+                    return _LOW_BRUSH
+                if role == Qt.ItemDataRole.FontRole:
+                    return _LOW_FONT
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+
+class LowStockFilter(QSortFilterProxyModel):
+    """Sorts on raw values and optionally hides rows above LOW_STOCK_THRESHOLD."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.low_only = False
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def set_low_only(self, low_only):
+        self.low_only = bool(low_only)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.low_only:
+            return True
+        return self.sourceModel().qty(source_row) <= LOW_STOCK_THRESHOLD
+
+
+class StockPanel(QWidget):
+    """Stock table with a low-stock filter toggle."""
+    def __init__(self, game, parent=None):
+        super().__init__(parent)
+        self.model = StockTableModel(game, self)
+        self.proxy = LowStockFilter(self)
+        self.proxy.setSourceModel(self.model)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.low_only_box = QCheckBox(f"Low stock only (≤ {LOW_STOCK_THRESHOLD})")
+        self.low_only_box.toggled.connect(self.proxy.set_low_only)
+        layout.addWidget(self.low_only_box)
+
+        self.view = QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)   # catalog order
+        self.view.setAlternatingRowColors(True)
+        self.view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.view.setMinimumHeight(250)
+
+        # Fixed row heights and column widths: no per-row measuring, which
+        # keeps large catalogs cheap to lay out and scroll.
+        rows = self.view.verticalHeader()
+        rows.setVisible(False)
+        rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        rows.setDefaultSectionSize(self.view.fontMetrics().height() + 6)
+        columns = self.view.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        columns.setStretchLastSection(True)
+        layout.addWidget(self.view)
+
+    def set_game(self, game):
+        self.model.set_game(game)
+
+    def refresh(self, changed):
+        self.model.refresh(changed)
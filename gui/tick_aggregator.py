@@ -0,0 +1,77 @@
+# gui/tick_aggregator.py
+
+from __future__ import annotations
+
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from game.config import UI_FPS
+
+COUNTERS = ("served", "lost_queue", "lost_stock", "lost_patience")
+
+
+def merge_ticks(ticks: list[dict]) -> dict:
+    """Fold consecutive ticks into one: counters summed, latest state kept."""
+    last = ticks[-1]
+    merged = {
+        "turn": ticks[0]["turn"],
+        "turns": last["turn"] + last["turns"] - ticks[0]["turn"],
+        "clock": last["clock"],
+        "queue_size": last["queue_size"],
+        "cash": last["cash"],
+        "ticks": ticks,
+    }
+    for key in COUNTERS:
+        merged[key] = sum(t[key] for t in ticks)
+
+    stock_changes: dict = {}
+    for t in ticks:
+        for ing, delta in t["stock_changes"].items():
+            stock_changes[ing] = stock_changes.get(ing, 0) + delta
+    merged["stock_changes"] = {ing: d for ing, d in stock_changes.items() if d}
+
+    # Drinks sold, by hour of day (ticks carry one turn's sales each)
+    hour_sales: dict = {}
+    for t in ticks:
+        if t["sales"]:
+            hour = hour_sales.setdefault(t["clock"].split(":")[0] + ":00", {})
+            for name, count in t["sales"].items():
+                hour[name] = hour.get(name, 0) + count
+    merged["hour_sales"] = hour_sales
+    return merged
+
+
+class TickAggregator(QObject):
+    """
+    Buffers ticks pushed from the simulation thread and delivers them to the
+    GUI thread at most UI_FPS times per second, merged into one update.
+
+    push() is a deque append, so the simulation thread never waits on the UI.
+    """
+    flushed = pyqtSignal(dict)
+
+    def __init__(self, fps: int = UI_FPS, parent=None):
+        super().__init__(parent)
+        self._pending: deque[dict] = deque()
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, int(1000 / fps)))
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, info: dict):
+        self._pending.append(info)
+
+    def start(self):
+        self._pending.clear()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        self.flush()
+
+    def flush(self):
+        ticks = []
+        while self._pending:
+            ticks.append(self._pending.popleft())
+        if ticks:
+            self.flushed.emit(merge_ticks(ticks))
@@ -6,6 +6,7 @@ def main():
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    window.offer_resume()
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+"""
+Import-time guard for the startup path.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, then
+fails if the total import time exceeds the budget or if any module that is
+meant to load lazily (charting, NumPy) was pulled in before the window shows.
+
+    python scripts/import_budget.py [--budget-ms 300] [--runs 3] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for `import main`, in milliseconds
+DEFAULT_BUDGET_MS = 300
+
+# Top-level packages that must not be imported at startup
+LAZY_PACKAGES = ("matplotlib", "numpy")
+
+
+def measure(module="main"):
+    """Return [(cumulative_us, depth, name)] for one cold import of `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(cumulative), depth, name.strip()))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="best of N runs is used")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--module", default="main")
+    args = parser.parse_args(argv)
+
+    best = None
+    for _ in range(args.runs):
+        rows = measure(args.module)
+        total = sum(us for us, depth, _ in rows if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    total, rows = best
+
+    print(f"import {args.module}: {total / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for us, depth, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    failures = []
+    if total / 1000 > args.budget_ms:
+        failures.append(f"over budget by {total / 1000 - args.budget_ms:.1f} ms")
+    eager = sorted({name.split(".")[0] for _, _, name in rows} & set(LAZY_PACKAGES))
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())